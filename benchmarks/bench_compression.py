@@ -0,0 +1,62 @@
+# Huffman benchmark: bit string encoder/decoder vs bit-packed canonical encoder and table-driven decoder
+# Run from the repository root: python -m benchmarks.bench_compression [size_mb]
+import os
+import random
+import sys
+import time
+import tools.compression as compression
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "documents")
+
+def sample_text(size_mb):
+    # Shuffled words from the sample documents so the text is not one short repeated block
+    words = []
+    for filename in sorted(os.listdir(DOCS_DIR)):
+        words.extend(compression.load_text_file(os.path.join(DOCS_DIR, filename)).split())
+    rng = random.Random(42)
+    target = int(size_mb * 1_000_000)
+    parts = []
+    length = 0
+    while length < target:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def bench_string_encoder(text, frequency):
+    huff_codes, _ = compression.generate_huffman_codes(compression.build_huffman_tree(frequency))
+    encoded = compression.encode_text(text, huff_codes)
+    return compression.binary_string_to_bytes(encoded)[0]
+
+def bench_packed_encoder(text, frequency):
+    codes = compression.build_canonical_codes(compression.build_code_lengths(frequency))
+    return compression.encode_packed(text, codes)[0]
+
+if __name__ == "__main__":
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    text = sample_text(size_mb)
+    frequency = compression.build_frequency_table(text)
+    orig_size = len(text.encode("utf-8"))
+    print(f"Input: {orig_size / 1e6:.2f} MB")
+
+    print("Encoding")
+    for name, func in [("bit string", bench_string_encoder), ("bit-packed", bench_packed_encoder)]:
+        encoded, seconds = timed(func, text, frequency)
+        ratio = 100 - (len(encoded) / orig_size) * 100
+        print(f"{name:>10}: {seconds:.3f}s  {orig_size / 1e6 / seconds:6.2f} MB/s  {len(encoded)} bytes  ratio {ratio:.2f}%")
+
+    print("Decoding")
+    codes = compression.build_canonical_codes(compression.build_code_lengths(frequency))
+    encoded, padding = compression.encode_packed(text, codes)
+    reverse_codes = {code: char for char, code in compression.canonical_code_strings(codes).items()}
+    bits = compression.bytes_to_binary_string(encoded)[:len(encoded) * 8 - padding]
+    for name, func, args in [("bit string", compression.decode_text, (bits, reverse_codes)),
+                             ("table", compression.decode_packed, (encoded, codes, padding))]:
+        decoded, seconds = timed(func, *args)
+        assert decoded == text
+        print(f"{name:>10}: {seconds:.3f}s  {orig_size / 1e6 / seconds:6.2f} MB/s")
@@ -0,0 +1,21 @@
+# Plagiarism check benchmark: every algorithm on the same pair of texts
+# Run from the repository root: python -m benchmarks.bench_search [comparison_mb] [main_kb]
+import sys
+import tools.searchTools as search
+from benchmarks.bench_compression import sample_text, timed
+
+if __name__ == "__main__":
+    comparison_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    main_kb = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    text2 = sample_text(comparison_mb)
+    text1 = sample_text(main_kb / 1000)
+    print(f"Main text: {len(text1)} chars, comparison text: {len(text2)} chars")
+
+    expected = None
+    for algo in search.PLAGIARISM_ALGORITHMS:
+        (matches, similarity), seconds = timed(search.find_matching_phrases, text1, text2, algo)
+        if algo in ("KMP", "Rabin-Karp", "Aho-Corasick"):
+            # Same phrase semantics, so the results must agree exactly
+            expected = expected or matches
+            assert matches == expected
+        print(f"{algo:>16}: {seconds:.3f}s  {len(matches)} matches  similarity {similarity:.2f}%")
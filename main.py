@@ -1,13 +1,29 @@
+import time
+START_TIME = time.perf_counter()  # for --startup-time
+
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import hashlib
+import math
 import os
-from datetime import datetime
+import re
+import sys
+from bisect import bisect_left
 import tools.compression as compression
 import tools.searchTools as search
-from tools.sorting import merge_sort, counting_sort
+from tools.sorting import merge_sort, counting_sort, field_key
+import tools.minHash as minhash
+import tools.invertedIndex as inverted_index
+import tools.scanCache as scan_cache
+from tools.jobRunner import Job
+
+SEARCH_DEBOUNCE_MS = 30  # wait for a pause in typing before searching
+HIGHLIGHT_MARGIN_CHARS = 2000  # matches this far outside the visible text are tagged too
+RESULTS_PAGE_SIZE = 100  # rows per page in the copied passages table
+LABEL_NODE_LIMIT = 100  # bigger graphs are drawn with small unlabeled nodes
+LARGE_GRAPH_NODES = 300  # bigger graphs are laid out one connected component at a time
+LARGE_LAYOUT_ITERATIONS = 20
+TRAVERSAL_LABEL_NODES = 30  # most recent nodes listed under the graph during a traversal
 
 # Frame
 class CSUFScanner(tk.Tk):
@@ -18,19 +34,18 @@ class CSUFScanner(tk.Tk):
         self.configure(bg="#f4f4f4")
 
         self.frames = {}
-        container = ttk.Frame(self)
-        container.pack(fill="both", expand=True)
-
-        # Initialize all frames
-        for F in (HomePage, PlagiarismPage, SearchPage, CompressionPage, GraphAnalysisPage, SortingPage):
-            frame = F(parent=container, controller=self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.container = ttk.Frame(self)
+        self.container.pack(fill="both", expand=True)
 
         self.show_frame(HomePage)
 
     def show_frame(self, page_class):
-        frame = self.frames[page_class]
+        # Pages are built the first time they are shown, so startup only pays for the home page
+        frame = self.frames.get(page_class)
+        if frame is None:
+            frame = page_class(parent=self.container, controller=self)
+            self.frames[page_class] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
         frame.tkraise()
 
 
@@ -72,6 +87,59 @@ def show_scrollable_message(title, message):
 
     ttk.Button(popup, text="Close", command=popup.destroy).pack(pady=10)
 
+class JobStatusBar(ttk.Frame):
+    # Progress bar + Cancel button for work that runs on a background thread
+    # The job never touches widgets; on_done(result) is called back on the Tk thread
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.job = None
+        self.on_done = None
+
+        self.status_label = ttk.Label(self, text="", width=30)
+        self.status_label.grid(row=0, column=0, padx=10, sticky="w")
+        self.progress = ttk.Progressbar(self, length=300, mode="determinate", maximum=100)
+        self.progress.grid(row=0, column=1, padx=10)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.grid(row=0, column=2, padx=10)
+
+    def run(self, func, *args, on_done, label="Working...", **kwargs):
+        if self.job and not self.job.finished():
+            messagebox.showwarning("Busy", "Please wait for the current task to finish or cancel it.")
+            return
+        self.on_done = on_done
+        self.status_label.config(text=label)
+        self.progress["value"] = 0
+        self.cancel_button.config(state="normal")
+        self.job = Job(func, *args, **kwargs).start()
+        self.after(100, self.poll)
+
+    def poll(self):
+        job = self.job
+        if job.total:
+            self.progress["value"] = job.done * 100 / job.total
+        if not job.finished():
+            self.after(100, self.poll)
+            return
+
+        self.cancel_button.config(state="disabled")
+        if job.state == "done":
+            self.progress["value"] = 100
+            self.status_label.config(text="Done")
+            self.on_done(job.result)
+        elif job.state == "cancelled":
+            self.progress["value"] = 0
+            self.status_label.config(text="Cancelled")
+        else:
+            self.progress["value"] = 0
+            self.status_label.config(text="Failed")
+            messagebox.showerror("Error", str(job.error))
+
+    def cancel(self):
+        if self.job and not self.job.finished():
+            self.job.cancel()
+            self.status_label.config(text="Cancelling...")
+
+
 class PlagiarismPage(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -97,12 +165,15 @@ class PlagiarismPage(ttk.Frame):
         control_frame = ttk.LabelFrame(self, text="Plagiarism Detection")
         control_frame.pack(fill="x", padx=15, pady=10)
 
-        self.algorithm_choice = ttk.Combobox(control_frame, values=["KMP", "Rabin-Karp"], width=25)
+        self.algorithm_choice = ttk.Combobox(control_frame, values=search.PLAGIARISM_ALGORITHMS, width=25)
         self.algorithm_choice.set("Choose Matching Algorithm")
         self.algorithm_choice.grid(row=0, column=0, padx=10, pady=10)
 
         ttk.Button(control_frame, text="Run Plagiarism Check", command=self.plagiarism_check).grid(row=0, column=1, padx=10, pady=10)
 
+        self.job_status = JobStatusBar(self)
+        self.job_status.pack(pady=5)
+
         # Similarity Percentage Bar Section
         self.similarity_label = ttk.Label(self, text="Similarity: 0%")
         self.similarity_label.pack(pady=10)
@@ -111,52 +182,115 @@ class PlagiarismPage(ttk.Frame):
         self.similarity_canvas = tk.Canvas(self, width=400, height=40, bg="white")
         self.similarity_canvas.pack(pady=10)
 
+        # Results Section: only the rows of the current page exist in the Treeview,
+        # so drawing it costs the same for ten passages or ten thousand
+        results_frame = ttk.LabelFrame(self, text="Copied Passages")
+        results_frame.pack(fill="both", expand=True, padx=15, pady=(0, 10))
+
+        self.passage_results = ttk.Treeview(results_frame, columns=("main", "comparison", "length", "passage"), show="headings", height=5)
+        for column, heading, width in (("main", "Main", 90), ("comparison", "Comparison", 90), ("length", "Length", 60), ("passage", "Passage", 400)):
+            self.passage_results.heading(column, text=heading, command=lambda c=column: self.sort_passages(c))
+            self.passage_results.column(column, width=width, anchor="w" if column == "passage" else "center")
+        self.passage_results.grid(row=0, column=0, columnspan=3, padx=10, pady=(5, 0), sticky="we")
+        self.passage_results.bind("<<TreeviewSelect>>", self.show_passage)
+
+        ttk.Button(results_frame, text="< Prev", command=lambda: self.show_page(self.page - 1)).grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.page_label = ttk.Label(results_frame, text="No results")
+        self.page_label.grid(row=1, column=1, pady=5)
+        ttk.Button(results_frame, text="Next >", command=lambda: self.show_page(self.page + 1)).grid(row=1, column=2, padx=10, pady=5, sticky="e")
+        results_frame.columnconfigure(1, weight=1)
+
+        for box in (self.box1, self.box2):
+            box.tag_config("match", background="yellow")
+
+        self.passage_text = ""
+        self.passages = []  # (start1, end1, start2, end2) offsets into box1 and box2
+        self.passage_order = []  # indexes into self.passages in display order
+        self.sort_column = "main"
+        self.sort_reverse = False
+        self.page = 0
+
     def plagiarism_check(self):
-        text1 = self.box1.get("1.0", tk.END).strip()
-        text2 = self.box2.get("1.0", tk.END).strip()
+        # Unstripped text so passage offsets index straight into the text boxes
+        text1 = self.box1.get("1.0", "end-1c")
+        text2 = self.box2.get("1.0", "end-1c")
 
-        if not text1 or not text2:
+        if not text1.strip() or not text2.strip():
             messagebox.showwarning("Input Missing", "Both documents must be loaded.")
             return
 
         algo = self.algorithm_choice.get()
-        if algo not in ["KMP", "Rabin-Karp"]:
+        if algo not in search.PLAGIARISM_ALGORITHMS:
             messagebox.showwarning("Algorithm Missing", "Please select a matching algorithm.")
             return
 
-        # Phrase segmentation (e.g., 5-word phrases)
-        phrases = []
-        words = text1.split()
-        phrase_len = 4
-
-        for i in range(len(words) - phrase_len + 1):
-            phrase = " ".join(words[i:i + phrase_len])
-            phrases.append(phrase)
+        # Phrase segmentation (4-word phrases) and matching, off the Tk thread
+        self.job_status.run(self.check_texts, text1, text2, algo,
+                            on_done=self.show_plagiarism_results, label="Checking phrases...")
 
-        matches = []
-        for phrase in phrases:
-            if algo == "KMP":
-                found = search.kmp_search(text2, phrase)
-            else:
-                found = search.rabin_karp(text2, phrase)
-
-            if found:
-                matches.append((phrase, found))
+    # Runs on the worker thread: the table and the percentage both come from the chosen algorithm,
+    # one row per maximal passage (Suffix Automaton) or per matched phrase (the others)
+    def check_texts(self, text1, text2, algo, progress):
+        _, passages, similarity_percent = search.plagiarism_report(text1, text2, algo, 4, progress)
+        return text1, passages, similarity_percent
 
-        total_checked = len(phrases)
-        matched_count = len(matches)
-        similarity_percent = (matched_count / total_checked) * 100 if total_checked else 0
+    def show_plagiarism_results(self, result):
+        text1, passages, similarity_percent = result
 
         # Update the similarity bar and label
         self.update_similarity_bar(similarity_percent)
 
-        # Display plagiarism results
-        if matches:
-            result_text = "\n\n".join([f"'{p}' found at positions {pos}" for p, pos in matches])
-            result_text = f"Similarity: {similarity_percent:.2f}%\n\n" + result_text
-            messagebox.showinfo("Plagiarism Detected", f"Matching phrases found:\n\n{result_text}")
+        # Display plagiarism results: one row per maximal copied passage
+        self.passage_text = text1
+        self.passages = passages
+        self.sort_column, self.sort_reverse = "main", False
+        self.passage_order = list(range(len(passages)))  # plagiarism_report returns them in main text order
+        for box in (self.box1, self.box2):
+            box.tag_remove("match", "1.0", tk.END)
+        self.show_page(0)
+
+    def sort_passages(self, column):
+        # Clicking the same heading again flips the order
+        self.sort_reverse = not self.sort_reverse if column == self.sort_column else False
+        self.sort_column = column
+        if column == "main":
+            key = lambda i: self.passages[i][0]
+        elif column == "comparison":
+            key = lambda i: self.passages[i][2]
+        elif column == "length":
+            key = lambda i: self.passages[i][1] - self.passages[i][0]
+        else:
+            key = lambda i: self.passage_text[self.passages[i][0]:self.passages[i][1]].lower()
+        self.passage_order.sort(key=key, reverse=self.sort_reverse)
+        self.show_page(0)
+
+    def show_page(self, page):
+        pages = max(1, -(-len(self.passage_order) // RESULTS_PAGE_SIZE))
+        self.page = min(max(page, 0), pages - 1)
+        self.passage_results.delete(*self.passage_results.get_children())
+        first = self.page * RESULTS_PAGE_SIZE
+        for i in self.passage_order[first:first + RESULTS_PAGE_SIZE]:
+            start1, end1, start2, end2 = self.passages[i]
+            excerpt = " ".join(self.passage_text[start1:start1 + 200].split())
+            if len(excerpt) > 80:
+                excerpt = excerpt[:77] + "..."
+            self.passage_results.insert("", tk.END, iid=str(i), values=(start1, start2, end1 - start1, excerpt))
+
+        if self.passages:
+            self.page_label.config(text=f"{len(self.passages)} matches, page {self.page + 1} of {pages}")
         else:
-            messagebox.showinfo("No Plagiarism Detected", "No matching phrases found.")
+            self.page_label.config(text="No matches found")
+
+    def show_passage(self, event=None):
+        selection = self.passage_results.selection()
+        if not selection:
+            return
+        start1, end1, start2, end2 = self.passages[int(selection[0])]
+        for box, start, end in ((self.box1, start1, end1), (self.box2, start2, end2)):
+            box.tag_remove("match", "1.0", tk.END)
+            box.tag_add("match", f"1.0+{start}c", f"1.0+{end}c")
+            box.see(f"1.0+{end}c")
+            box.see(f"1.0+{start}c")
 
     def load_file_into_box(self, box):
         file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
@@ -165,6 +299,21 @@ class PlagiarismPage(ttk.Frame):
                 contents = file.read()
                 box.delete("1.0", tk.END)
                 box.insert(tk.END, contents)
+            # The old passages' offsets point into the text that was just replaced
+            self.clear_results()
+
+    def clear_results(self):
+        self.job_status.cancel()  # a check still running was started on the old text
+        self.passage_text = ""
+        self.passages = []
+        self.passage_order = []
+        self.page = 0
+        self.passage_results.delete(*self.passage_results.get_children())
+        self.page_label.config(text="No results")
+        for box in (self.box1, self.box2):
+            box.tag_remove("match", "1.0", tk.END)
+        self.similarity_label.config(text="Similarity: 0%")
+        self.similarity_canvas.delete("all")
 
     def update_similarity_bar(self, similarity_percent):
         # Update the similarity percentage label
@@ -209,7 +358,18 @@ class CompressionPage(ttk.Frame):
         ttk.Button(upload_frame, text="Upload Document", command=lambda: self.load_file_into_box(self.box1)).grid(row=0, column=0, padx=10, pady=10)
         ttk.Button(upload_frame, text="Upload Document", command=lambda: self.load_file_into_box(self.box2)).grid(row=0, column=1, padx=10, pady=10)
 
-        ttk.Button(self, text="Compress Documents", command=self.compress_documents).pack(pady=10)
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Compress Documents", command=self.compress_documents).grid(row=0, column=0, padx=10)
+        ttk.Button(button_frame, text="Compress Large File", command=self.compress_large_file).grid(row=0, column=1, padx=10)
+        ttk.Button(button_frame, text="Decompress File", command=self.decompress_large_file).grid(row=0, column=2, padx=10)
+        ttk.Button(button_frame, text="Compress Folder", command=self.compress_folder).grid(row=1, column=0, padx=10, pady=(5, 0))
+        self.shared_table = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Shared code table", variable=self.shared_table).grid(row=1, column=1, padx=10, pady=(5, 0))
+        ttk.Button(button_frame, text="Analyze Folder", command=self.analyze_folder).grid(row=1, column=2, padx=10, pady=(5, 0))
+
+        self.job_status = JobStatusBar(self)
+        self.job_status.pack(pady=5)
 
         # Main Text Compression Section
         self.original_label1 = ttk.Label(upload_frame, text="Original Size: -")
@@ -250,23 +410,132 @@ class CompressionPage(ttk.Frame):
                 box.delete("1.0", tk.END)
                 box.insert(tk.END, contents)
 
-    def compress_documents(self):
-        for idx, (box, orig_label, comp_label, file_prefix, encoded_box) in enumerate([
-            (self.box1, self.original_label1, self.compressed_label1, "doc1", self.encoded_box1),
-            (self.box2, self.original_label2, self.compressed_label2, "doc2", self.encoded_box2)
-        ], start=1):
-            text = box.get("1.0", tk.END).strip()
-            if text:
-                frequency = compression.build_frequency_table(text)
-                tree = compression.build_huffman_tree(frequency)
-                huff_codes, _ = compression.generate_huffman_codes(tree)
-                encoded = compression.encode_text(text, huff_codes)
-                encoded_bytes, _ = compression.binary_string_to_bytes(encoded)
+    def compress_large_file(self):
+        # Streams the file block by block, so it never has to fit in a text box or in memory
+        source = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        if not source:
+            return
+        dest = filedialog.asksaveasfilename(defaultextension=".cshs", filetypes=[("Compressed Stream", "*.cshs")])
+        if not dest:
+            return
+        self.job_status.run(self.compress_stream, source, dest,
+                            on_done=self.show_large_file_result, label="Compressing file...")
+
+    # Runs on the worker thread; errors are reported by the status bar's error dialog
+    def compress_stream(self, source, dest, progress=None):
+        try:
+            return compression.compress_file(source, dest, progress=progress)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Could not compress file: it is not UTF-8 text ({e})") from e
+        except OSError as e:
+            raise ValueError(f"Could not compress file: {e}") from e
+
+    def show_large_file_result(self, sizes):
+        orig_size, comp_size = sizes
+        compression_ratio = (100 - (comp_size / orig_size) * 100) if orig_size else 0
+        messagebox.showinfo("Compression Complete",
+                            f"Original Size: {orig_size} bytes\nCompressed Size: {comp_size} bytes\nCompression Ratio: {compression_ratio:.2f}%")
+
+    def decompress_large_file(self):
+        source = filedialog.askopenfilename(filetypes=[("Compressed Stream", "*.cshs")])
+        if not source:
+            return
+        dest = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+        if not dest:
+            return
+        self.job_status.run(self.decompress_stream, source, dest, label="Decompressing...",
+                            on_done=lambda _: messagebox.showinfo("Decompression Complete", f"Restored text saved to:\n{dest}"))
+
+    # Runs on the worker thread; a damaged file is reported by the status bar's error dialog
+    def decompress_stream(self, source, dest, progress=None):
+        try:
+            compression.decompress_file(source, dest, progress)
+        except (ValueError, OSError) as e:
+            raise ValueError(f"Could not decompress file: {e}") from e
+
+    def compress_folder(self):
+        # Every .txt file is compressed in its own worker process into <folder>/compressed
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        output_dir = os.path.join(folder, "compressed")
+        import tools.batchCompression as batch_compression
+        self.job_status.run(batch_compression.compress_folder, folder, output_dir, shared_table=self.shared_table.get(),
+                            on_done=lambda results: self.show_folder_results(results, output_dir), label="Compressing folder...")
+
+    def show_folder_results(self, results, output_dir):
+        if not results:
+            messagebox.showinfo("No Files", "No .txt files found in the selected folder.")
+            return
+
+        compressed = [r for r in results if "error" not in r]
+        total_orig = sum(r["original_size"] for r in compressed)
+        total_comp = sum(r["compressed_size"] for r in compressed)
+        total_ratio = (100 - (total_comp / total_orig) * 100) if total_orig else 0
+        lines = [f"{os.path.basename(r['path'])}: failed ({r['error']})" if "error" in r else
+                 f"{os.path.basename(r['path'])}: {r['original_size']} -> {r['compressed_size']} bytes ({r['ratio']:.2f}%)"
+                 for r in results]
+        summary = f"Saved to: {output_dir}\nTotal: {total_orig} -> {total_comp} bytes ({total_ratio:.2f}%)\n\n" + "\n".join(lines)
+        show_scrollable_message("Folder Compression", summary)
+
+    def analyze_folder(self):
+        # Entropy and predicted Huffman size from a character histogram, without encoding anything
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        import tools.compressionStats as compression_stats  # may load NumPy, so only on demand
+        self.job_status.run(compression_stats.plan_folder, folder, on_done=self.show_folder_plan, label="Analyzing folder...")
 
-                compression.save_compressed_data(encoded_bytes, filename=f"{file_prefix}_compressed.bin")
+    def show_folder_plan(self, profiles):
+        if not profiles:
+            messagebox.showinfo("No Files", "No .txt files found in the selected folder.")
+            return
+
+        lines = []
+        for p in profiles:
+            if not p["text"]:
+                lines.append(f"{os.path.basename(p['path'])}: not UTF-8 text, {p['byte_entropy']:.2f} bits/byte, "
+                             f"{p['original_size']} bytes [skip]")
+                continue
+            verdict = "compress" if p["worth_compressing"] else "skip"
+            lines.append(f"{os.path.basename(p['path'])}: {p['entropy']:.2f} bits/char ({p['byte_entropy']:.2f} bits/byte), "
+                         f"{p['original_size']} -> ~{p['predicted_size']} bytes ({p['predicted_ratio']:.2f}%) [{verdict}]")
+        show_scrollable_message("Compression Planning", "\n".join(lines))
 
-                orig_size = len(text.encode('utf-8'))
-                comp_size = len(encoded_bytes)
+    def compress_documents(self):
+        texts = [self.box1.get("1.0", tk.END).strip(), self.box2.get("1.0", tk.END).strip()]
+        self.job_status.run(self.compress_texts, texts, on_done=self.show_compression_results, label="Compressing...")
+
+    # Runs on the worker thread, so it must not touch any widgets
+    def compress_texts(self, texts, progress=None):
+        results = []
+        for idx, text in enumerate(texts):
+            if progress:
+                progress(idx, len(texts))
+            if not text:
+                results.append(None)
+                continue
+            frequency = compression.build_frequency_table(text)
+            code_lengths = compression.build_code_lengths(frequency)
+            canonical_codes = compression.build_canonical_codes(code_lengths)
+            encoded_bytes, padding = compression.encode_packed(text, canonical_codes)
+
+            # Saved with a header (code table, bit length, checksum) so it can be decompressed later
+            container = compression.build_container(text, canonical_codes, encoded_bytes, padding)
+            compression.save_compressed_data(container, filename=f"doc{idx + 1}_compressed.bin")
+
+            huff_codes = compression.canonical_code_strings(canonical_codes)
+            # The saved file, header included, is what the document actually costs on disk
+            results.append((huff_codes, len(text.encode('utf-8')), len(container)))
+        return results
+
+    def show_compression_results(self, results):
+        for idx, (result, orig_label, comp_label, encoded_box) in enumerate([
+            (results[0], self.original_label1, self.compressed_label1, self.encoded_box1),
+            (results[1], self.original_label2, self.compressed_label2, self.encoded_box2)
+        ], start=1):
+            if result:
+                huff_codes, orig_size, comp_size = result
 
                 orig_label.config(text=f"Original Size: {orig_size} bytes")
                 comp_label.config(text=f"Compressed Size: {comp_size} bytes")
@@ -327,15 +596,122 @@ class SearchPage(ttk.Frame):
 
         self.search_entry = ttk.Entry(upload_frame, width=30)
         self.search_entry.grid(row=0, column=2, padx=10, pady=10, sticky="w")
-        self.search_entry.bind("<KeyRelease>", self.perform_search)
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
 
         self.result_label = ttk.Label(upload_frame, text="Occurrences Found: 0")
         self.result_label.grid(row=0, column=3, padx=10, pady=10, sticky="w")
 
+        # Folder Search Section (word/phrase hits per file from the inverted index)
+        self.index = {}
+        self.index_folder = None
+
+        folder_frame = ttk.LabelFrame(self, text="Search a Folder")
+        folder_frame.pack(fill="x", padx=15, pady=10)
+
+        ttk.Button(folder_frame, text="Upload Folder", command=self.load_folder).grid(row=0, column=0, padx=10, pady=10, sticky="w")
+        self.folder_label = ttk.Label(folder_frame, text="No folder indexed")
+        self.folder_label.grid(row=0, column=1, padx=10, pady=10, sticky="w")
+
+        self.folder_results = ttk.Treeview(folder_frame, columns=("file", "hits"), show="headings", height=5)
+        self.folder_results.heading("file", text="File")
+        self.folder_results.heading("hits", text="Hits")
+        self.folder_results.column("file", width=450)
+        self.folder_results.column("hits", width=80, anchor="center")
+        self.folder_results.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="we")
+        self.folder_results.bind("<Double-1>", self.open_folder_result)
+
+        self.job_status = JobStatusBar(self)
+        self.job_status.pack(pady=5)
+
         # Text Box Section
-        self.text_box = scrolledtext.ScrolledText(self, wrap="word", width=80, height=20, font=("Courier", 10))
+        self.text_box = scrolledtext.ScrolledText(self, wrap="word", width=80, height=14, font=("Courier", 10))
         self.text_box.pack(padx=15, pady=10)
         self.text_box.tag_config("highlight", background="yellow")
+        self.text_box.bind("<<Modified>>", self.on_text_modified)
+        self.text_box.configure(yscrollcommand=self.on_text_scroll)
+
+        # Incremental search state
+        self.pending_search = None
+        self.pending_refresh = None
+        self.text_lower = None  # lowercase copy of the text box, rebuilt only when the text changes
+        self.last_query = ""
+        self.last_hits = []  # every start offset of last_query, overlapping ones included
+        self.match_starts = []  # non-overlapping matches that are counted and highlighted
+        self.match_len = 0
+        self.highlighted = set()  # (start, end) offsets currently tagged
+
+    def schedule_search(self, event=None):
+        # Debounce: a burst of keystrokes only runs one search
+        if self.pending_search:
+            self.after_cancel(self.pending_search)
+        self.pending_search = self.after(SEARCH_DEBOUNCE_MS, self.perform_search)
+
+    def reset_search_cache(self):
+        self.text_lower = None
+        self.last_query = ""
+        self.last_hits = []
+        self.match_starts = []
+        self.text_box.tag_remove("highlight", "1.0", tk.END)
+        self.highlighted = set()
+
+    def on_text_scroll(self, first, last):
+        self.text_box.vbar.set(first, last)
+        if not self.pending_refresh:
+            self.pending_refresh = self.after_idle(self.refresh_highlights)
+
+    def on_text_modified(self, event=None):
+        if self.text_box.edit_modified():
+            self.text_box.edit_modified(False)
+            self.reset_search_cache()
+            self.schedule_search()
+
+    def find_hits(self, query):
+        if self.text_lower is None:
+            text = self.text_box.get("1.0", "end-1c")
+            lower = text.lower()
+            if len(lower) != len(text):
+                # A few characters grow when lowercased; leave those as-is so offsets still line up
+                lower = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+            self.text_lower = lower
+
+        if self.last_query and query.startswith(self.last_query):
+            # The query only grew: a new hit must start where the previous query matched
+            hits = [pos for pos in self.last_hits if self.text_lower.startswith(query, pos)]
+        elif search.compute_lps(query)[-1] == 0:
+            # No prefix of the query is also a suffix, so matches can never overlap
+            hits = [m.start() for m in re.finditer(re.escape(query), self.text_lower)]
+        else:
+            hits = []
+            pos = self.text_lower.find(query)
+            while pos != -1:
+                hits.append(pos)
+                pos = self.text_lower.find(query, pos + 1)
+        self.last_query, self.last_hits = query, hits
+        return hits
+
+    def char_offset(self, index):
+        return (self.text_box.count("1.0", index, "chars") or (0,))[0]
+
+    def refresh_highlights(self):
+        # Only matches around the visible part of the text are tagged, so a query with
+        # thousands of hits costs the same as one with a handful
+        self.pending_refresh = None
+        first = self.char_offset("@0,0") - HIGHLIGHT_MARGIN_CHARS
+        last = self.char_offset(f"@{self.text_box.winfo_width()},{self.text_box.winfo_height()}") + HIGHLIGHT_MARGIN_CHARS
+        lo = bisect_left(self.match_starts, first - self.match_len)
+        hi = bisect_left(self.match_starts, last)
+        self.update_highlights({(pos, pos + self.match_len) for pos in self.match_starts[lo:hi]})
+
+    def update_highlights(self, ranges):
+        # Only the tags that changed are touched instead of clearing and re-adding all of them
+        for start, end in self.highlighted - ranges:
+            self.text_box.tag_remove("highlight", f"1.0+{start}c", f"1.0+{end}c")
+        added = []
+        for start, end in ranges - self.highlighted:
+            added.extend((f"1.0+{start}c", f"1.0+{end}c"))
+        if added:
+            self.text_box.tag_add("highlight", *added)
+        self.highlighted = ranges
 
     def load_document(self):
         file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
@@ -344,43 +720,92 @@ class SearchPage(ttk.Frame):
                 content = file.read()
                 self.text_box.delete("1.0", tk.END)
                 self.text_box.insert(tk.END, content)
+                self.reset_search_cache()
                 self.perform_search()  # Trigger search after load
 
+    def load_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            # Built once per folder, off the Tk thread; every keystroke afterwards is only a lookup
+            self.job_status.run(inverted_index.index_folder, folder,
+                                on_done=lambda index: self.set_index(folder, index), label="Indexing folder...")
+
+    def set_index(self, folder, index):
+        self.index = index
+        self.index_folder = folder
+        self.folder_label.config(text=folder)
+        self.perform_search()
+
+    def open_folder_result(self, event=None):
+        selection = self.folder_results.selection()
+        if selection and self.index_folder:
+            filename = self.folder_results.item(selection[0], "values")[0]
+            # Same decoding as index_folder, so every indexed file can be opened
+            with open(os.path.join(self.index_folder, filename), 'r', encoding='utf-8', errors='replace') as file:
+                self.text_box.delete("1.0", tk.END)
+                self.text_box.insert(tk.END, file.read())
+            self.reset_search_cache()
+            self.perform_search()
+
+    def update_folder_results(self, phrase):
+        self.folder_results.delete(*self.folder_results.get_children())
+        if not phrase or not self.index:
+            return
+        hits = inverted_index.search_index(self.index, phrase)
+        for filename, count in sorted(hits.items(), key=lambda item: (-item[1], item[0])):
+            self.folder_results.insert("", tk.END, values=(filename, count))
+
     def perform_search(self, event=None):
+        self.pending_search = None
         phrase = self.search_entry.get().strip()
-        text = self.text_box.get("1.0", tk.END)
-        self.text_box.tag_remove("highlight", "1.0", tk.END)
+        self.update_folder_results(phrase)
 
         if not phrase:
+            self.match_starts = []
+            self.update_highlights(set())
             self.result_label.config(text="Occurrences Found: 0")
             return
 
-        count = 0
-        idx = "1.0"
-
-        # Naive search
-        while True:
-            idx = self.text_box.search(phrase, idx, nocase=True, stopindex=tk.END)
-            if not idx:
-                break
-            end_idx = f"{idx}+{len(phrase)}c"
-            self.text_box.tag_add("highlight", idx, end_idx)
-            idx = end_idx
-            count += 1
+        # Naive search semantics: case-insensitive and matches do not overlap
+        query = phrase.lower()
+        hits = self.find_hits(query)
+        if search.compute_lps(query)[-1]:
+            starts = []
+            next_free = 0
+            for pos in hits:
+                if pos >= next_free:
+                    starts.append(pos)
+                    next_free = pos + len(query)
+            hits = starts
+        self.match_starts, self.match_len = hits, len(query)
+        self.refresh_highlights()
 
-        self.result_label.config(text=f"Occurrences Found: {count}")
+        self.result_label.config(text=f"Occurrences Found: {len(hits)}")
 
 
 class GraphAnalysisPage(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+
+        import networkx as nx  # Local import: only loaded when this page is first opened
+        import tools.graphTraversal as graph_traversal
+        self.nx = nx
+        self.graph_traversal = graph_traversal
         self.graph = nx.Graph()
         self.pos = {}
         self.traversal_type = tk.StringVar(value="BFS")
+        self.graph_kind = tk.StringVar(value="Similarity")
+        self.citation_graphs = {}  # folder -> CitationGraph, updated in place on each upload
         self.visited_order = []
         self.visited_set = set()
         self.animation = False
+        self.layout_cache = {}  # graph content hash -> node positions
+        self.node_artist = None
+        self.overlay_artist = None  # repaints only the nodes whose color changed, then blits
+        self.label_artists = {}
+        self.node_index = {}
+        self.node_colors = []
 
         ttk.Label(self, text="Graph Analysis", font=("Segoe UI", 14, "bold"), foreground="#2F2D92").pack(pady=10)
         ttk.Button(self, text="← Back to Home", command=lambda: controller.show_frame(HomePage)).pack(anchor="w", padx=10)
@@ -403,11 +828,27 @@ class GraphAnalysisPage(ttk.Frame):
 
         ttk.Button(control_frame, text="Start Traversal", command=self.start_traversal).grid(row=0, column=5, padx=10, pady=10)
 
+        ttk.Label(control_frame, text="Jaccard Threshold:").grid(row=1, column=0, padx=10, pady=(0, 10), sticky="e")
+        self.threshold = ttk.Spinbox(control_frame, from_=0.05, to=1.0, increment=0.05, width=6)
+        self.threshold.set(0.3)
+        self.threshold.grid(row=1, column=1, padx=10, pady=(0, 10), sticky="w")
+
+        ttk.Button(control_frame, text="Find Clusters", command=self.show_clusters).grid(row=1, column=2, padx=10, pady=(0, 10))
+
+        ttk.Radiobutton(control_frame, text="Similarity", variable=self.graph_kind, value="Similarity").grid(row=1, column=3, padx=10, pady=(0, 10))
+        ttk.Radiobutton(control_frame, text="Citations", variable=self.graph_kind, value="Citations").grid(row=1, column=4, padx=10, pady=(0, 10))
+
+        self.job_status = JobStatusBar(self)
+        self.job_status.pack(pady=5)
+
         self.result_label = ttk.Label(self, text="Traversal Order: ", wraplength=700)
         self.result_label.pack(pady=10)
         self.canvas_frame = ttk.LabelFrame(self, text="Graph Visualization")
         self.canvas_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        self.figure, self.ax = plt.subplots(figsize=(5, 3))  # Adjusted size
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.figure = Figure(figsize=(5, 3))  # Adjusted size
+        self.ax = self.figure.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.canvas_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
         self.ax.axis('off')  # Blank canvas by default
@@ -416,47 +857,187 @@ class GraphAnalysisPage(ttk.Frame):
     def load_documents_folder(self):
         folder = filedialog.askdirectory()
         if folder:
-            doc_texts = {}
-            for filename in os.listdir(folder):
-                if filename.endswith(".txt"):
-                    path = os.path.join(folder, filename)
-                    with open(path, 'r', encoding='utf-8') as f:
-                        words = set(f.read().lower().split())
-                        doc_texts[filename] = words
-
-            # Build graph from documents
-            self.graph.clear()
-            self.graph.add_nodes_from(doc_texts.keys())
-
-            for doc1, words1 in doc_texts.items():
-                for doc2, words2 in doc_texts.items():
-                    if doc1 != doc2 and len(words1.intersection(words2)) >= 3:
-                        self.graph.add_edge(doc1, doc2)
-
-            self.pos = nx.spring_layout(self.graph, seed=42)
-            self.start_node['values'] = list(self.graph.nodes)
-            self.draw_graph()
-
-    def draw_graph(self, highlight_node=None):
+            try:
+                threshold = float(self.threshold.get())
+            except ValueError:
+                threshold = None
+            # 0 would link every pair of documents (and LSH cannot be tuned for it); nan fails both tests
+            if threshold is None or not 0 < threshold <= 1:
+                messagebox.showerror("Error", "Jaccard threshold must be a number greater than 0 and at most 1.")
+                return
+            if self.animation:
+                messagebox.showwarning("Busy", "Please wait for the traversal to finish.")
+                return
+
+            if self.graph_kind.get() == "Citations":
+                self.job_status.run(self.build_citation_graph, folder,
+                                    on_done=self.show_similarity_graph, label="Loading citations...")
+            else:
+                self.job_status.run(self.build_similarity_graph, folder, threshold,
+                                    on_done=self.show_similarity_graph, label="Loading documents...")
+
+    # Runs on the worker thread, so it must not touch any widgets
+    def build_similarity_graph(self, folder, threshold, progress=None):
+        # Word sets and MinHash signatures come from the scan cache; only new or changed files are read
+        entries = scan_cache.scan_folder(folder, progress=progress)
+        doc_texts = {filename: entry["words"] for filename, entry in entries.items()}
+        signatures = {filename: entry["signature"] for filename, entry in entries.items()}
+
+        # Build graph from documents
+        graph = self.nx.Graph()
+        graph.add_nodes_from(doc_texts.keys())
+
+        # MinHash + LSH only compares candidate pairs; weight is the Jaccard similarity
+        for doc1, doc2, similarity in minhash.similarity_edges(doc_texts, threshold=threshold, known_signatures=signatures):
+            graph.add_edge(doc1, doc2, weight=similarity)
+
+        return graph, self.layout_graph(graph)
+
+    # Runs on the worker thread, so it must not touch any widgets
+    def build_citation_graph(self, folder, progress=None):
+        # Citations are extracted once per file version by the scan cache; the folder's citation graph
+        # is kept between uploads and only new, edited or deleted documents change its edges
+        from tools.citationGraph import CitationGraph
+        entries = scan_cache.scan_folder(folder, progress=progress, features=False)
+        citations = self.citation_graphs.setdefault(os.path.abspath(folder), CitationGraph())
+        citations.sync(entries)
+
+        graph = self.nx.DiGraph()  # edges point from the citing document to the cited one
+        graph.add_nodes_from(entries)
+        graph.add_edges_from(citations.edges())
+        return graph, self.layout_graph(graph)
+
+    # Same nodes and weighted edges -> same hash, so reloading a folder reuses its layout
+    def graph_key(self, graph):
+        digest = hashlib.sha1()
+        for node in sorted(graph.nodes):
+            digest.update(f"{node}\0".encode("utf-8"))
+        edges = sorted((min(u, v), max(u, v), round(data.get("weight", 1), 6)) for u, v, data in graph.edges(data=True))
+        for u, v, weight in edges:
+            digest.update(f"{u}\0{v}\0{weight}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def layout_graph(self, graph):
+        key = self.graph_key(graph)
+        if key not in self.layout_cache:
+            if len(graph) <= LARGE_GRAPH_NODES:
+                self.layout_cache[key] = self.nx.spring_layout(graph, seed=42)
+            else:
+                self.layout_cache[key] = self.component_layout(graph)
+        return self.layout_cache[key]
+
+    # Large graphs: a short spring layout per connected component and a plain grid for documents
+    # with no similar neighbor, packed in rows with each component given area for its size
+    def component_layout(self, graph):
+        if graph.is_directed():
+            components = self.nx.weakly_connected_components(graph)
+        else:
+            components = self.nx.connected_components(graph)
+        components = sorted(components, key=len, reverse=True)
+        isolated = sorted(node for component in components if len(component) == 1 for node in component)
+        blocks = []
+        for component in components:
+            if len(component) == 1:
+                continue
+            subgraph = graph.subgraph(component)
+            if len(component) < 500:
+                layout = self.nx.spring_layout(subgraph, seed=42, iterations=LARGE_LAYOUT_ITERATIONS)
+            else:
+                layout = self.nx.circular_layout(subgraph)  # spring_layout needs SciPy from 500 nodes
+            blocks.append((math.sqrt(len(component)), {node: (x / 2, y / 2) for node, (x, y) in layout.items()}))
+        if isolated:
+            side = math.ceil(math.sqrt(len(isolated)))
+            blocks.append((side, {node: ((i % side + 0.5) / side - 0.5, 0.5 - (i // side + 0.5) / side)
+                                  for i, node in enumerate(isolated)}))
+
+        pos = {}
+        row_width = math.sqrt(sum(size * size for size, _ in blocks)) * 1.2
+        x = y = row_height = 0
+        for size, layout in blocks:
+            if x and x + size > row_width:
+                x, y, row_height = 0, y + row_height, 0
+            for node, (nx_, ny_) in layout.items():
+                pos[node] = (x + size / 2 + nx_ * size, -(y + size / 2) + ny_ * size)
+            x += size
+            row_height = max(row_height, size)
+        return pos
+
+    # Groups of documents linked by chains of similar pairs, from one union-find pass over the edges
+    def show_clusters(self):
+        if not self.graph.nodes:
+            messagebox.showerror("Error", "Please upload a folder with documents first.")
+            return
+
+        from tools.unionFind import DisjointSet
+        clusters = DisjointSet()
+        clusters.add_edges(self.graph.edges(data="weight", default=1.0))
+        report = clusters.cluster_report()
+        if not report:
+            messagebox.showinfo("Clusters", "No documents are similar enough to form a cluster.")
+            return
+
+        lines = []
+        for n, cluster in enumerate(report, 1):
+            lines.append(f"Cluster {n}: {cluster['size']} documents, {cluster['edges']} similar pairs, "
+                         f"mean similarity {cluster['mean_similarity']:.2f}, max {cluster['max_similarity']:.2f}, "
+                         f"density {cluster['density']:.2f}")
+            lines.append("  " + ", ".join(cluster["members"]))
+        show_scrollable_message("Document Clusters", "\n".join(lines))
+
+    def show_similarity_graph(self, result):
+        self.graph, self.pos = result
+        self.visited_set = set()
+        self.start_node['values'] = list(self.graph.nodes)
+        self.draw_graph()
+
+    # Full redraw, only when a new graph is loaded; traversal steps go through recolor_nodes
+    def draw_graph(self):
         self.ax.clear()
+        self.node_artist = None
+        self.label_artists = {}
         if not self.graph.nodes:
             self.ax.axis('off')
             self.canvas.draw()
             return
 
-        node_colors = []
-        for node in self.graph.nodes():
-            if node == highlight_node:
-                node_colors.append("orange")
-            elif node in self.visited_set:
-                node_colors.append("#A2CFFE")
-            else:
-                node_colors.append("lightgray")
+        nodes = list(self.graph.nodes())
+        self.node_index = {node: i for i, node in enumerate(nodes)}
+        self.node_colors = ["#A2CFFE" if node in self.visited_set else "lightgray" for node in nodes]
+        small = len(nodes) <= LABEL_NODE_LIMIT
+        node_size = 1000 if small else max(5, 30000 // len(nodes))  # smaller dots as the graph grows
 
-        nx.draw(self.graph, self.pos, with_labels=True, ax=self.ax,
-                node_color=node_colors, node_size=1000, font_size=10)
+        if self.graph.is_directed():
+            # Arrow patches are drawn one by one, so large citation graphs get plain lines
+            self.nx.draw_networkx_edges(self.graph, self.pos, ax=self.ax, arrows=small, node_size=node_size)
+        else:
+            self.nx.draw_networkx_edges(self.graph, self.pos, ax=self.ax)
+        self.node_artist = self.nx.draw_networkx_nodes(self.graph, self.pos, nodelist=nodes, ax=self.ax,
+                                                       node_color=self.node_colors, node_size=node_size)
+        if small:
+            self.label_artists = self.nx.draw_networkx_labels(self.graph, self.pos, ax=self.ax, font_size=10)
+        # Animated artists are left out of full draws and only painted on request
+        self.overlay_artist = self.nx.draw_networkx_nodes(self.graph, self.pos, nodelist=nodes[:1], ax=self.ax, node_size=node_size)
+        self.overlay_artist.set_animated(True)
+        self.ax.axis('off')
         self.canvas.draw()
 
+    # changes: (node, color) pairs. The changed nodes and their labels are painted over the
+    # current image and only the plot area is blitted, so a step costs the same for 10 or 10,000 nodes
+    def recolor_nodes(self, changes):
+        if self.node_artist is None or not changes:
+            return
+        for node, color in changes:
+            self.node_colors[self.node_index[node]] = color
+        self.node_artist.set_facecolor(self.node_colors)  # keeps full redraws (e.g. on resize) up to date
+
+        self.overlay_artist.set_offsets([self.pos[node] for node, _ in changes])
+        self.overlay_artist.set_facecolor([color for _, color in changes])
+        self.ax.draw_artist(self.overlay_artist)
+        for node, _ in changes:
+            if node in self.label_artists:
+                self.ax.draw_artist(self.label_artists[node])
+        self.canvas.blit(self.ax.bbox)
+
     def start_traversal(self):
         if not self.graph.nodes:
             messagebox.showerror("Error", "Please upload a folder with documents first.")
@@ -467,54 +1048,41 @@ class GraphAnalysisPage(ttk.Frame):
             messagebox.showerror("Error", "Please select a valid start node.")
             return
 
+        self.recolor_nodes([(node, "lightgray") for node in self.visited_set])
         self.visited_order = []
         self.visited_set = set()
         self.animation = True
 
-        if self.traversal_type.get() == "BFS":
-            self.queue = [start]
-            self.visited_set.add(start)
-            self.bfs()
-        else:
-            self.stack = [start]
-            self.dfs()
+        # The whole order is computed up front on the CSR graph; the animation only replays it
+        csr = self.graph_traversal.CSRGraph.from_adjacency(self.graph.adj)
+        order = csr.bfs(start) if self.traversal_type.get() == "BFS" else csr.dfs(start)
+        self.pending_nodes = csr.node_names(order)
+        self.pending_nodes.reverse()  # popped from the end
+        self.step_traversal()
 
-    def bfs(self):
-        if not self.queue:
+    def step_traversal(self):
+        if not self.pending_nodes:
             self.finish_traversal()
             return
 
-        node = self.queue.pop(0)
+        node = self.pending_nodes.pop()
+        changes = [(self.visited_order[-1], "#A2CFFE")] if self.visited_order else []
+        self.visited_set.add(node)
         self.visited_order.append(node)
-        self.result_label.config(text="Traversal Order: " + " → ".join(self.visited_order))
-        self.draw_graph(highlight_node=node)
-
-        for neighbor in self.graph.neighbors(node):
-            if neighbor not in self.visited_set:
-                self.queue.append(neighbor)
-                self.visited_set.add(neighbor)
-        self.after(700, self.bfs)
-
-    def dfs(self):
-        while self.stack:
-            node = self.stack.pop()
-            if node not in self.visited_set:
-                self.visited_set.add(node)
-                self.visited_order.append(node)
-                self.result_label.config(text="Traversal Order: " + " → ".join(self.visited_order))
-                self.draw_graph(highlight_node=node)
-
-                neighbors = list(self.graph.neighbors(node))
-                neighbors.reverse()
-                self.stack.extend(neighbors)
-
-                self.after(700, self.dfs)
-                return
-        self.finish_traversal()
+        self.show_traversal_order()
+        self.recolor_nodes(changes + [(node, "orange")])
+        self.after(700, self.step_traversal)
+
+    # Long traversals only show their most recent nodes, so the label stays one or two lines
+    def show_traversal_order(self):
+        shown = self.visited_order[-TRAVERSAL_LABEL_NODES:]
+        prefix = f"... ({len(self.visited_order)} visited) → " if len(self.visited_order) > len(shown) else ""
+        self.result_label.config(text="Traversal Order: " + prefix + " → ".join(shown))
 
     def finish_traversal(self):
         self.animation = False
-        self.draw_graph()
+        if self.visited_order:
+            self.recolor_nodes([(self.visited_order[-1], "#A2CFFE")])
         messagebox.showinfo("Done", f"{self.traversal_type.get()} traversal complete!")
 
 
@@ -534,6 +1102,9 @@ class SortingPage(ttk.Frame):
         self.folder_label = ttk.Label(folder_frame, text="No folder selected")
         self.folder_label.grid(row=0, column=1, sticky="w")
 
+        self.job_status = JobStatusBar(self)
+        self.job_status.pack(pady=5)
+
         sort_frame = ttk.LabelFrame(self, text="Sorting Options")
         sort_frame.pack(fill="x", padx=15, pady=10)
 
@@ -541,11 +1112,15 @@ class SortingPage(ttk.Frame):
         self.sort_field.set("Sort by...")
         self.sort_field.grid(row=0, column=0, padx=10, pady=10)
 
+        self.then_field = ttk.Combobox(sort_frame, values=["then by...", "author", "title", "date"], state="readonly")
+        self.then_field.set("then by...")
+        self.then_field.grid(row=0, column=1, padx=10, pady=10)
+
         self.sort_algo = ttk.Combobox(sort_frame, values=["Merge Sort", "Counting Sort"], state="readonly")
         self.sort_algo.set("Choose Algorithm")
-        self.sort_algo.grid(row=0, column=1, padx=10, pady=10)
+        self.sort_algo.grid(row=0, column=2, padx=10, pady=10)
 
-        ttk.Button(sort_frame, text="Sort Documents", command=self.sort_documents).grid(row=0, column=2, padx=10, pady=10)
+        ttk.Button(sort_frame, text="Sort Documents", command=self.sort_documents).grid(row=0, column=3, padx=10, pady=10)
 
         self.result_box = scrolledtext.ScrolledText(self, width=80, height=20, font=("Courier", 10))
         self.result_box.pack(padx=15, pady=10)
@@ -555,41 +1130,17 @@ class SortingPage(ttk.Frame):
         folder = filedialog.askdirectory()
         if folder:
             self.folder_label.config(text=folder)
-            self.files_metadata = self.scan_folder(folder)
+            self.job_status.run(self.scan_folder, folder, on_done=self.set_files_metadata, label="Scanning folder...")
 
-    def scan_folder(self, folder):
-        files = []
-        for filename in os.listdir(folder):
-            if filename.endswith(".txt"):
-                path = os.path.join(folder, filename)
-                author = title = date_str = "Unknown"
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        for _ in range(3):  # only check first 3 lines
-                            line = f.readline().strip()
-                            if line.lower().startswith("author:"):
-                                author = line.split(":", 1)[1].strip()
-                            elif line.lower().startswith("title:"):
-                                title = line.split(":", 1)[1].strip()
-                            elif line.lower().startswith("date:"):
-                                date_str = line.split(":", 1)[1].strip()
-                    try:
-                        date_obj = datetime.strptime(date_str, "%B %d, %Y")
-                    except Exception:
-                        date_obj = None
-                except Exception as e:
-                    print(f"Error reading {filename}: {e}")
-                    date_obj = None
-
-                files.append({
-                    "filename": filename,
-                    "author": author,
-                    "title": title,
-                    "date": date_obj,
-                    "date_str": date_str,
-                    "year": date_obj.year if date_obj else 0
-                })
+    def set_files_metadata(self, files):
+        self.files_metadata = files
 
+    # Runs on the worker thread, so it must not touch any widgets
+    def scan_folder(self, folder, progress=None):
+        # Metadata is parsed once per file version and reused from the on-disk scan cache
+        files = []
+        for filename, entry in scan_cache.scan_folder(folder, progress=progress, features=False).items():
+            files.append(dict(entry["metadata"], filename=filename))
         return files
 
     def sort_documents(self):
@@ -598,21 +1149,29 @@ class SortingPage(ttk.Frame):
             return
 
         field = self.sort_field.get()
+        then = self.then_field.get()
         algo = self.sort_algo.get()
         sorted_data = ""
 
-        if field == "date" and algo != "Counting Sort":
-            messagebox.showwarning("Invalid Sort", "Date can only be sorted using Counting Sort.")
+        if field not in ["author", "title", "date"]:
+            messagebox.showwarning("Invalid Sort", "Please choose a field to sort by.")
             return
-        elif field in ["author", "title"] and algo != "Merge Sort":
-            messagebox.showwarning("Invalid Sort", f"{field.capitalize()} can only be sorted using Merge Sort.")
+        elif algo not in ["Merge Sort", "Counting Sort"]:
+            messagebox.showwarning("Invalid Sort", "Please choose a sorting algorithm.")
             return
 
+        # Ties on the first field are ordered by the second
+        fields = [field]
+        if then in ["author", "title", "date"] and then != field:
+            fields.append(then)
+
         # Perform the sorting
         if algo == "Merge Sort":
-            sorted_data = merge_sort(self.files_metadata, key=lambda x: x[field].lower())
+            # Keys are computed once per document
+            sorted_data = merge_sort(self.files_metadata, key=[field_key(name) for name in fields])
         elif algo == "Counting Sort":
-            sorted_data = counting_sort(self.files_metadata)
+            # Radix sort on integer codes: date ordinals, or author/title ids in alphabetical order
+            sorted_data = counting_sort(self.files_metadata, fields)
         
         self.display_sorted_results(sorted_data)
 
@@ -656,4 +1215,10 @@ class SortingPage(ttk.Frame):
 
 if __name__ == "__main__":
     app = CSUFScanner()
-    app.mainloop()
+    if "--startup-time" in sys.argv:
+        # Time from the first import until the home page has been drawn
+        app.update()
+        print(f"Startup time: {time.perf_counter() - START_TIME:.3f}s")
+        app.destroy()
+    else:
+        app.mainloop()
@@ -0,0 +1,89 @@
+# Compresses many documents at once by fanning them out over a process pool
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import tools.compression as compression
+
+MAX_CHUNK_FILES = 8  # files sent to a worker process at a time
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+def _count_characters(path):
+    try:
+        return Counter(_read_text(path))
+    except (OSError, UnicodeDecodeError):
+        return Counter()  # _compress_one reports the error for this file
+
+# Runs inside a worker process; only the small result dict is sent back
+# A file that cannot be read or encoded gets {"path", "error"} instead, and the rest of the batch goes on
+def _compress_one(path, output_dir, canonical_codes):
+    try:
+        return _compress_file(path, output_dir, canonical_codes)
+    except (OSError, UnicodeDecodeError, KeyError) as e:
+        # KeyError: a character missing from the shared table (the file changed after it was counted)
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+def _compress_file(path, output_dir, canonical_codes):
+    text = _read_text(path)
+    if canonical_codes is None:
+        data = compression.pack_container(text)
+    else:
+        encoded_bytes, padding = compression.encode_packed(text, canonical_codes)
+        data = compression.build_container(text, canonical_codes, encoded_bytes, padding)
+
+    if output_dir:
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(os.path.join(output_dir, f"{name}_compressed.bin"), "wb") as f:
+            f.write(data)
+
+    original_size = len(text.encode("utf-8"))
+    compressed_size = len(data)
+    return {
+        "path": path,
+        "original_size": original_size,
+        "compressed_size": compressed_size,
+        "ratio": (100 - (compressed_size / original_size) * 100) if original_size else 0
+    }
+
+# Corpus-wide code table: character counts from every file merged into one frequency table
+def build_shared_codes(paths, executor):
+    frequency = Counter()
+    for counts in executor.map(_count_characters, paths):
+        frequency.update(counts)
+    if not frequency:
+        return {}
+    return compression.build_canonical_codes(compression.build_code_lengths(frequency))
+
+# Returns one result per path, in the same order as paths; failed files have an "error" field instead of sizes
+# output_dir: where <name>_compressed.bin files are written (None only measures sizes)
+# shared_table: encode every file with one code table built from the whole batch
+# progress(done, total) is called as results come back, if given
+def compress_batch(paths, output_dir=None, shared_table=False, max_workers=None, progress=None):
+    paths = list(paths)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    # Workers are spawned, never forked: the GUI starts the pool from a job thread of a multi-threaded
+    # Tk process, and a forked child can inherit a lock some other thread was holding
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        try:
+            canonical_codes = build_shared_codes(paths, executor) if shared_table else None
+            worker = partial(_compress_one, output_dir=output_dir, canonical_codes=canonical_codes)
+            # Small chunks keep progress reports (and so cancelling) regular on big batches
+            chunksize = max(1, min(MAX_CHUNK_FILES, len(paths) // ((max_workers or os.cpu_count() or 1) * 4)))
+            results = []
+            for result in executor.map(worker, paths, chunksize=chunksize):
+                results.append(result)
+                if progress:
+                    progress(len(results), len(paths))
+            return results
+        except BaseException:
+            executor.shutdown(cancel_futures=True)  # a cancelled job does not wait for the queued files
+            raise
+
+def compress_folder(folder, output_dir=None, shared_table=False, max_workers=None, progress=None):
+    paths = [os.path.join(folder, filename) for filename in sorted(os.listdir(folder)) if filename.endswith(".txt")]
+    return compress_batch(paths, output_dir, shared_table, max_workers, progress)
@@ -0,0 +1,146 @@
+# Citations between documents, and a graph of them that is updated one document at a time
+# A citation is a key: ("author", surname, year) from "(Das, 2022)", "Das (2022)" or a reference
+# entry, or ("title", normalized title) from a reference entry. A document is cited by another
+# when one of its own keys (from its Author/Title/Date header) is among the other's citations
+import re
+
+REFERENCE_HEADING = re.compile(r"^\s*(references|bibliography|works cited|sources)\s*:?\s*$", re.I)
+PARENTHETICAL = re.compile(r"\(([^()]*\d{4}[^()]*)\)")
+AUTHOR_YEAR = re.compile(r"([A-Z][\w'’-]+)(?:\s+et al\.?)?(?:\s+(?:and|&)\s+[A-Z][\w'’-]+)?,?\s+(\d{4})\b")
+NARRATIVE = re.compile(r"([A-Z][\w'’-]+)(?:\s+et al\.?)?(?:\s+(?:and|&)\s+[A-Z][\w'’-]+)?\s+\((\d{4})\)")
+REFERENCE_AUTHOR = re.compile(r"^\s*(?:\[\d+\]\s*|\d+\.\s+)?([A-Z][\w'’-]+),")
+REFERENCE_YEAR = re.compile(r"\b(1[5-9]\d\d|20\d\d)\b")
+QUOTED_TITLE = re.compile(r"[\"“]([^\"”]{3,})[\"”]")
+APA_TITLE = re.compile(r"\(\d{4}[a-z]?\)\.\s+([^.]{3,})")
+
+def normalize_title(title):
+    return " ".join(re.findall(r"\w+", title.lower()))
+
+#Splits off a trailing References/Bibliography/Works Cited section; returns (body, reference lines)
+def split_references(text):
+    lines = text.split("\n")
+    for i in range(len(lines) - 1, -1, -1):
+        if REFERENCE_HEADING.match(lines[i]):
+            return "\n".join(lines[:i]), [line for line in lines[i + 1:] if line.strip()]
+    return text, []
+
+#Returns the citation keys of a text, each once, in order of appearance
+def extract_citations(text):
+    body, references = split_references(text)
+    keys = []
+    for match in PARENTHETICAL.finditer(body):
+        # "(Das, 2022; Lee and Kim 2021)" cites both
+        for author, year in AUTHOR_YEAR.findall(match.group(1)):
+            keys.append(("author", author.lower(), int(year)))
+    for author, year in NARRATIVE.findall(body):
+        keys.append(("author", author.lower(), int(year)))
+    for line in references:
+        author = REFERENCE_AUTHOR.match(line)
+        year = REFERENCE_YEAR.search(line)
+        if author and year:
+            keys.append(("author", author.group(1).lower(), int(year.group(1))))
+        title = QUOTED_TITLE.search(line) or APA_TITLE.search(line)
+        if title:
+            keys.append(("title", normalize_title(title.group(1))))
+    return list(dict.fromkeys(keys))
+
+#Keys other documents can cite this one by, from parse_metadata's fields
+#A blank "Author:" or "Title:" line gives "" rather than "Unknown", and yields no key either
+def document_keys(metadata):
+    keys = []
+    names = metadata["author"].split()
+    if names and metadata["author"] != "Unknown" and metadata["year"]:
+        keys.append(("author", names[-1].lower(), metadata["year"]))
+    title = normalize_title(metadata["title"])
+    if title and metadata["title"] != "Unknown":
+        keys.append(("title", title))
+    return keys
+
+# Adjacency is kept in both directions as dicts (insertion ordered, so traversals are repeatable),
+# plus an index from each key to the documents it names and to the documents citing it.
+# Adding or removing a document only touches its own keys and edges, and a citation of a document
+# that has not arrived yet is linked as soon as that document is added
+class CitationGraph:
+    def __init__(self):
+        self.cites = {}  # document -> {cited document: None}
+        self.cited_by = {}  # document -> {citing document: None}
+        self.documents = {}  # document -> {"keys", "citations", "digest"}
+        self.named_by = {}  # key -> {document with that key: None}
+        self.citing = {}  # key -> {document citing that key: None}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, name):
+        return name in self.documents
+
+    def edge_count(self):
+        return sum(len(targets) for targets in self.cites.values())
+
+    def edges(self):
+        for source, targets in self.cites.items():
+            for target in targets:
+                yield source, target
+
+    def _link(self, source, target):
+        if source != target:
+            self.cites[source][target] = None
+            self.cited_by[target][source] = None
+
+    #Adds (or replaces) a document; citations come from extract_citations, digest identifies the version
+    def add_document(self, name, metadata, citations, digest=None):
+        if name in self.documents:
+            self.remove_document(name)
+        keys = document_keys(metadata)
+        self.documents[name] = {"keys": keys, "citations": citations, "digest": digest}
+        self.cites[name] = {}
+        self.cited_by[name] = {}
+        for key in keys:
+            self.named_by.setdefault(key, {})[name] = None
+        for key in citations:
+            self.citing.setdefault(key, {})[name] = None
+
+        for key in citations:
+            for target in self.named_by.get(key, ()):
+                self._link(name, target)
+        # Documents that already cited this one before it arrived
+        for key in keys:
+            for source in self.citing.get(key, ()):
+                self._link(source, name)
+
+    def remove_document(self, name):
+        document = self.documents.pop(name, None)
+        if document is None:
+            return
+        for index, keys in ((self.named_by, document["keys"]), (self.citing, document["citations"])):
+            for key in keys:
+                del index[key][name]
+                if not index[key]:
+                    del index[key]
+        for target in self.cites.pop(name):
+            del self.cited_by[target][name]
+        for source in self.cited_by.pop(name):
+            del self.cites[source][name]
+
+    #Brings the graph up to date with scan_cache.scan_folder entries: only documents that are new,
+    #edited (different content hash) or deleted are touched. Returns the number of documents changed
+    def sync(self, entries):
+        changed = 0
+        for name in [name for name in self.documents if name not in entries]:
+            self.remove_document(name)
+            changed += 1
+        for name, entry in entries.items():
+            document = self.documents.get(name)
+            digest = entry.get("sha256")  # entries analyzed without the cache have none
+            if document is None or digest is None or document["digest"] != digest:
+                self.add_document(name, entry["metadata"], entry["citations"], digest)
+                changed += 1
+        return changed
+
+    #Every document reachable by following citations from start (start first), in BFS or DFS order
+    #The traversal walks the live adjacency, so it never waits for a rebuild after an update
+    def reachable(self, start, method="BFS"):
+        import tools.graphTraversal as graph_traversal  # not at the top: scanCache imports this module at startup
+        if method == "BFS":
+            return graph_traversal.bfs(self.cites, start)
+        return graph_traversal.dfs(self.cites, start)
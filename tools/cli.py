@@ -0,0 +1,231 @@
+# Headless command line entry point for batch jobs (cron, workers without a display)
+# Usage: python -m tools.cli [--time] {plagiarism,compress,sort,graph,clusters,citations,archive} ...
+# Only the algorithm modules are imported here, never tkinter, networkx or matplotlib
+import argparse
+import json
+import os
+import sys
+import time
+import tools.searchTools as search
+import tools.minHash as minhash
+import tools.scanCache as scan_cache
+import tools.winnowing as winnowing
+from tools.unionFind import DisjointSet
+from tools.citationGraph import CitationGraph
+from tools.sorting import merge_sort, counting_sort, field_key
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def emit(record):
+    print(json.dumps(record, ensure_ascii=False))
+
+# Files are taken as-is, folders contribute their .txt files
+def expand_paths(paths):
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".txt"))
+        else:
+            expanded.append(path)
+    return expanded
+
+#features=False skips loading word sets and signatures from the cache
+def folder_entries(folder, use_cache, features=True):
+    if use_cache:
+        return scan_cache.scan_folder(folder, features=features)
+    # Read exactly as scan_folder reads, so --no-cache never changes the results
+    entries = {}
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".txt"):
+            try:
+                text = scan_cache.read_document(os.path.join(folder, filename))
+            except OSError as e:
+                print(f"Error reading {filename}: {e}", file=sys.stderr)
+                continue
+            entries[filename] = scan_cache.analyze_text(text)
+    return entries
+
+def run_plagiarism(args):
+    # Unstripped, like the GUI's text boxes, so passage offsets index straight into the files
+    text1 = read_text(args.main)
+    text2 = read_text(args.comparison)
+    matches, passages, similarity = search.plagiarism_report(text1, text2, args.algorithm, args.phrase_len)
+    emit({
+        "main": args.main,
+        "comparison": args.comparison,
+        "algorithm": args.algorithm,
+        "similarity": similarity,
+        "matches": [{"phrase": phrase, "positions": positions} for phrase, positions in matches],
+        "passages": [{"main": [start1, end1], "comparison": [start2, end2]} for start1, end1, start2, end2 in passages]
+    })
+
+def run_compress(args):
+    import tools.batchCompression as batch_compression
+    results = batch_compression.compress_batch(expand_paths(args.paths), args.output_dir,
+                                               shared_table=args.shared_table, max_workers=args.workers)
+    for result in results:
+        emit(result)
+    return 1 if any("error" in result for result in results) else 0  # non-zero exit when a file failed
+
+def run_sort(args):
+    files = [dict(entry["metadata"], filename=filename)
+             for filename, entry in folder_entries(args.folder, not args.no_cache, features=False).items()]
+    fields = [args.field] + [field for field in args.then if field != args.field]
+    algorithm = args.algorithm or ("counting" if fields == ["date"] else "merge")
+    if algorithm == "counting":
+        ordered = counting_sort(files, fields)
+    else:
+        ordered = merge_sort(files, key=[field_key(field) for field in fields])
+    for item in ordered:
+        emit({"filename": item["filename"], "author": item["author"], "title": item["title"], "date": item["date_str"]})
+
+def run_graph(args):
+    entries = folder_entries(args.folder, not args.no_cache)
+    doc_words = {filename: entry["words"] for filename, entry in entries.items()}
+    signatures = {filename: entry["signature"] for filename, entry in entries.items()}
+    edges = minhash.similarity_edges(doc_words, threshold=args.threshold, known_signatures=signatures)
+    emit({
+        "nodes": sorted(doc_words),
+        "edges": [{"source": a, "target": b, "weight": weight} for a, b, weight in edges]
+    })
+
+# Edges are read one line at a time: JSONL {"source", "target", "weight"}, the same fields as graph's edges
+def read_edges(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                edge = json.loads(line)
+                yield edge["source"], edge["target"], edge.get("weight", 1.0)
+
+def run_clusters(args):
+    clusters = DisjointSet()
+    if args.edges:
+        clusters.add_edges(read_edges(args.edges))
+    else:
+        entries = folder_entries(args.folder, not args.no_cache)
+        doc_words = {filename: entry["words"] for filename, entry in entries.items()}
+        signatures = {filename: entry["signature"] for filename, entry in entries.items()}
+        clusters.add_edges(minhash.similarity_edges(doc_words, threshold=args.threshold, known_signatures=signatures))
+    for cluster in clusters.cluster_report(args.min_size):
+        emit(cluster)
+
+def run_citations(args):
+    citations = CitationGraph()
+    citations.sync(folder_entries(args.folder, not args.no_cache, features=False))
+    if args.start:
+        if args.start not in citations:
+            sys.exit(f"{args.start} is not a document in {args.folder}")
+        emit({"start": args.start, "method": args.method, "reachable": citations.reachable(args.start, args.method)})
+    else:
+        emit({
+            "nodes": sorted(citations.documents),
+            "edges": [{"source": source, "target": target} for source, target in citations.edges()]
+        })
+
+def run_archive_add(args):
+    paths = expand_paths(args.paths)
+    added, total = winnowing.add_to_archive(args.archive, ((path, read_text(path)) for path in paths))
+    emit({"archive": args.archive, "added": added, "skipped": len(paths) - added, "documents": total})
+
+def run_archive_check(args):
+    archive = winnowing.load_archive(args.archive)
+    try:
+        for path in expand_paths(args.paths):
+            results = winnowing.check_archive(archive, read_text(path))
+            emit({
+                "path": path,
+                "matches": [{"document": name, "similarity": similarity, "offsets": pairs}
+                            for name, similarity, pairs in results[:args.top]]
+            })
+    finally:
+        winnowing.close_archive(archive)
+
+# argparse type for counts that must be at least 1 (a phrase of 0 words matches everywhere)
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def jaccard_threshold(value):
+    threshold = float(value)
+    if not 0 < threshold <= 1:
+        raise argparse.ArgumentTypeError(f"must be greater than 0 and at most 1, got {value}")
+    return threshold
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m tools.cli", description="CSUF Document Scanner batch tools (JSON/JSONL output)")
+    parser.add_argument("--time", action="store_true", help="print the elapsed time to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plagiarism = commands.add_parser("plagiarism", help="compare a main text against a comparison text")
+    plagiarism.add_argument("main")
+    plagiarism.add_argument("comparison")
+    plagiarism.add_argument("--algorithm", choices=search.PLAGIARISM_ALGORITHMS, default="Aho-Corasick")
+    plagiarism.add_argument("--phrase-len", type=positive_int, default=4, help="words per matched phrase")
+    plagiarism.set_defaults(func=run_plagiarism)
+
+    compress = commands.add_parser("compress", help="Huffman-compress files and folders, one JSON line per file")
+    compress.add_argument("paths", nargs="+")
+    compress.add_argument("--output-dir", help="write <name>_compressed.bin files here")
+    compress.add_argument("--shared-table", action="store_true", help="use one code table for every file")
+    compress.add_argument("--workers", type=positive_int, help="worker processes (default: CPU count)")
+    compress.set_defaults(func=run_compress)
+
+    sort = commands.add_parser("sort", help="sort a folder's documents by metadata, one JSON line per document")
+    sort.add_argument("folder")
+    sort.add_argument("--field", choices=["author", "title", "date"], default="author")
+    sort.add_argument("--then", action="append", default=[], choices=["author", "title", "date"],
+                      help="break ties by this field (repeatable)")
+    sort.add_argument("--algorithm", choices=["merge", "counting"],
+                      help="merge sort, or radix/counting sort on integer codes (default: counting for date alone)")
+    sort.add_argument("--no-cache", action="store_true", help="do not read or update the scan cache")
+    sort.set_defaults(func=run_sort)
+
+    graph = commands.add_parser("graph", help="similarity graph of a folder as JSON nodes and weighted edges")
+    graph.add_argument("folder")
+    graph.add_argument("--threshold", type=jaccard_threshold, default=0.3, help="minimum Jaccard similarity for an edge")
+    graph.add_argument("--no-cache", action="store_true", help="do not read or update the scan cache")
+    graph.set_defaults(func=run_graph)
+
+    clusters = commands.add_parser("clusters", help="groups of documents linked by similar pairs, one JSON line per group")
+    source = clusters.add_mutually_exclusive_group(required=True)
+    source.add_argument("folder", nargs="?", help="build the similarity edges from this folder")
+    source.add_argument("--edges", help="read edges from a JSONL file instead (source, target, weight)")
+    clusters.add_argument("--threshold", type=jaccard_threshold, default=0.3, help="minimum Jaccard similarity for an edge")
+    clusters.add_argument("--min-size", type=positive_int, default=2, help="smallest group to report")
+    clusters.add_argument("--no-cache", action="store_true", help="do not read or update the scan cache")
+    clusters.set_defaults(func=run_clusters)
+
+    citations = commands.add_parser("citations", help="citation graph of a folder, or the documents reachable from one")
+    citations.add_argument("folder")
+    citations.add_argument("--from", dest="start", help="list the documents this one cites, directly or through others")
+    citations.add_argument("--method", choices=["BFS", "DFS"], default="BFS", help="traversal order for --from")
+    citations.add_argument("--no-cache", action="store_true", help="do not read or update the scan cache")
+    citations.set_defaults(func=run_citations)
+
+    archive = commands.add_parser("archive", help="winnowing fingerprint archive of prior submissions")
+    archive_commands = archive.add_subparsers(dest="action", required=True)
+    archive_add = archive_commands.add_parser("add", help="fingerprint files and folders into the archive")
+    archive_add.add_argument("archive")
+    archive_add.add_argument("paths", nargs="+")
+    archive_add.set_defaults(func=run_archive_add)
+    archive_check = archive_commands.add_parser("check", help="match each file against every archived document, one JSON line per file")
+    archive_check.add_argument("archive")
+    archive_check.add_argument("paths", nargs="+")
+    archive_check.add_argument("--top", type=positive_int, default=10, help="most similar archived documents to report")
+    archive_check.set_defaults(func=run_archive_check)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    status = args.func(args) or 0
+    if args.time:
+        print(f"{args.command}: {time.perf_counter() - start:.3f}s", file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
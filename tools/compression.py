@@ -1,8 +1,11 @@
 import heapq
 from collections import defaultdict
+from itertools import accumulate
+from operator import itemgetter, lshift
 import os
-import tkinter as tk
-from tkinter import filedialog
+import re
+import struct
+import zlib
 
 # ==================== Huffman Coding Utilities ====================
 
@@ -67,9 +70,322 @@ def load_binary_file(path):
     with open(path, "rb") as file:
         return file.read()
 
+# ==================== Canonical Huffman (bit-packed) ====================
+
+# Text is encoded a word at a time (plus trailing spaces); long runs are cut so table entries stay small
+CHUNK_RE = re.compile(r"\S{1,16}\s{0,4}|\s{1,16}")
+CHUNK_TABLE_LIMIT = 1 << 16
+BLOCK_CHUNKS = 64
+
+# Same heap merge as build_huffman_tree, but only counts how deep each symbol ends up
+def build_code_lengths(frequency):
+    if len(frequency) == 1:
+        return {char: 1 for char in frequency}
+    lengths = {char: 0 for char in frequency}
+    heap = [[freq, order, [char]] for order, (char, freq) in enumerate(sorted(frequency.items()))]
+    heapq.heapify(heap)
+    order = len(heap)
+    while len(heap) > 1:
+        low1 = heapq.heappop(heap)
+        low2 = heapq.heappop(heap)
+        for char in low1[2] + low2[2]:
+            lengths[char] += 1
+        heapq.heappush(heap, [low1[0] + low2[0], order, low1[2] + low2[2]])
+        order += 1
+    return lengths
+
+# Canonical codes: symbols sorted by (length, symbol) get consecutive integers
+# Returns {char: (code, length)}
+def build_canonical_codes(code_lengths):
+    codes = {}
+    code = 0
+    prev_length = 0
+    for char in sorted(code_lengths, key=lambda c: (code_lengths[c], c)):
+        length = code_lengths[char]
+        code <<= length - prev_length
+        codes[char] = (code, length)
+        code += 1
+        prev_length = length
+    return codes
+
+def canonical_code_strings(canonical_codes):
+    # Only for display; the encoder itself never builds bit strings
+    return {char: format(code, f"0{length}b") for char, (code, length) in canonical_codes.items()}
+
+class _ChunkCodeTable(dict):
+    # Memo of chunk -> (code, length) built from the per-character codes on first use
+    def __init__(self, canonical_codes):
+        super().__init__()
+        self.codes = canonical_codes
+
+    def __missing__(self, chunk):
+        if len(self) >= CHUNK_TABLE_LIMIT:
+            self.clear()
+        code = length = 0
+        for char in chunk:
+            char_code, char_length = self.codes[char]
+            code = (code << char_length) | char_code
+            length += char_length
+        self[chunk] = (code, length)
+        return code, length
+
+# Packs codes straight into bytes; bits are written MSB first and the last byte is zero-padded
+# Returns (encoded_bytes, padding) like binary_string_to_bytes
+def encode_packed(text, canonical_codes):
+    table = _ChunkCodeTable(canonical_codes)
+    chunks = CHUNK_RE.findall(text)
+    out = bytearray()
+    carry = carry_bits = 0
+    for start in range(0, len(chunks), BLOCK_CHUNKS):
+        # Each block becomes one integer: every code is shifted left by the bits that follow it
+        entries = list(map(table.__getitem__, reversed(chunks[start:start + BLOCK_CHUNKS])))
+        shifts = list(accumulate(map(itemgetter(1), entries), initial=0))
+        total = shifts.pop()
+        value = sum(map(lshift, map(itemgetter(0), entries), shifts)) | (carry << total)
+        nbits = carry_bits + total
+        carry_bits = nbits & 7
+        out += (value >> carry_bits).to_bytes(nbits >> 3, "big")
+        carry = value & ((1 << carry_bits) - 1)
+    padding = (8 - carry_bits) % 8
+    if carry_bits:
+        out.append(carry << padding)
+    return bytes(out), padding
+
+# ==================== Table-Driven Decoding ====================
+
+# Binary tree of the canonical codes: children[node] = [zero_child, one_child]
+# Internal nodes are list indexes, leaves are the decoded characters
+def build_code_tree(canonical_codes):
+    children = [[None, None]]
+    for char, (code, length) in canonical_codes.items():
+        node = 0
+        for i in range(length - 1, 0, -1):
+            bit = (code >> i) & 1
+            if children[node][bit] is None:
+                children[node][bit] = len(children)
+                children.append([None, None])
+            node = children[node][bit]
+        children[node][code & 1] = char
+    return children
+
+# Walks one node through the tree bit by bit; returns the decoded characters and the node it stops at
+def _walk_bits(children, node, byte, first_bit, last_bit):
+    decoded = []
+    for i in range(first_bit, last_bit - 1, -1):
+        nxt = children[node][(byte >> i) & 1]
+        if nxt is None:
+            raise ValueError("Invalid Huffman code in compressed data")
+        if isinstance(nxt, str):
+            decoded.append(nxt)
+            node = 0
+        else:
+            node = nxt
+    return "".join(decoded), node
+
+class _ByteStepTable(dict):
+    # (tree node, next byte) -> (decoded characters, tree node after those 8 bits)
+    # Keys and returned nodes are pre-shifted by 8 so the lookup key is just node | byte
+    # Rows are filled the first time a combination shows up in the data
+    def __init__(self, children):
+        super().__init__()
+        self.children = children
+
+    def __missing__(self, key):
+        decoded, node = _walk_bits(self.children, key >> 8, key & 0xFF, 7, 0)
+        self[key] = (decoded, node << 8)
+        return self[key]
+
+# Decodes 8 bits per table lookup instead of one bit per dict lookup like decode_text
+# padding is the number of zero bits at the end of the last byte (as returned by encode_packed)
+def decode_packed(encoded_bytes, canonical_codes, padding=0):
+    if not encoded_bytes:
+        return ""
+    children = build_code_tree(canonical_codes)
+    lookup = _ByteStepTable(children).__getitem__
+    data = memoryview(encoded_bytes)
+    step = ("", 0)
+    # step carries the tree node from one byte to the next
+    decoded = [(step := lookup(step[1] | byte))[0] for byte in data[:-1]]
+    # The last byte is walked by hand so the padding bits are not decoded
+    tail, node = _walk_bits(children, step[1] >> 8, data[-1], 7, padding)
+    if node:
+        raise ValueError("Compressed data ends in the middle of a Huffman code")
+    decoded.append(tail)
+    return "".join(decoded)
+
+# ==================== Compressed Container Format ====================
+#
+# Version 1 layout (all integers big-endian):
+#   magic        4 bytes  b"CSHF"
+#   version      u8
+#   symbols      u32      number of distinct characters
+#   alphabet     u32 byte count + UTF-8 text, characters in canonical order (length, char)
+#   lengths      one u8 code length per character, same order
+#   char_count   u64      characters in the original text
+#   bit_length   u64      bits of payload that are real data (the rest of the last byte is padding)
+#   crc32        u32      CRC-32 of the original text encoded as UTF-8
+#   payload      packed canonical Huffman codes (encode_packed)
+
+CONTAINER_MAGIC = b"CSHF"
+CONTAINER_VERSION = 1
+
+# Header + payload for text that has already been encoded with encode_packed
+def build_container(text, canonical_codes, encoded_bytes, padding):
+    alphabet = sorted(canonical_codes, key=lambda c: (canonical_codes[c][1], c))
+    alphabet_bytes = "".join(alphabet).encode("utf-8")
+    header = CONTAINER_MAGIC + struct.pack(">BI", CONTAINER_VERSION, len(alphabet))
+    header += struct.pack(">I", len(alphabet_bytes)) + alphabet_bytes
+    header += bytes(canonical_codes[char][1] for char in alphabet)
+    header += struct.pack(">QQI", len(text), len(encoded_bytes) * 8 - padding, zlib.crc32(text.encode("utf-8")))
+    return header + encoded_bytes
+
+def pack_container(text):
+    if not text:
+        return build_container(text, {}, b"", 0)
+    canonical_codes = build_canonical_codes(build_code_lengths(build_frequency_table(text)))
+    encoded_bytes, padding = encode_packed(text, canonical_codes)
+    return build_container(text, canonical_codes, encoded_bytes, padding)
+
+def unpack_container(data):
+    try:
+        return _unpack_container(memoryview(data))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt container header: {e}") from e
+
+def _unpack_container(data):
+    if bytes(data[:4]) != CONTAINER_MAGIC:
+        raise ValueError("Not a compressed document (bad magic bytes)")
+    version, symbol_count = struct.unpack_from(">BI", data, 4)
+    if version != CONTAINER_VERSION:
+        raise ValueError(f"Unsupported container version {version}")
+    offset = 9
+    (alphabet_size,) = struct.unpack_from(">I", data, offset)
+    offset += 4
+    alphabet = bytes(data[offset:offset + alphabet_size]).decode("utf-8")
+    offset += alphabet_size
+    if len(alphabet) != symbol_count:
+        raise ValueError("Corrupt header: alphabet does not match symbol count")
+    lengths = data[offset:offset + symbol_count]
+    offset += symbol_count
+    # Kraft inequality: the lengths must describe a valid prefix code
+    max_length = max(lengths, default=0)
+    if 0 in lengths or sum(1 << (max_length - length) for length in lengths) > (1 << max_length):
+        raise ValueError("Corrupt header: invalid code lengths")
+    char_count, bit_length, checksum = struct.unpack_from(">QQI", data, offset)
+    offset += 20
+
+    payload = data[offset:]
+    if len(payload) != (bit_length + 7) // 8:
+        raise ValueError("Corrupt container: payload size does not match bit length")
+    padding = len(payload) * 8 - bit_length
+    if padding and payload[-1] & ((1 << padding) - 1):
+        raise ValueError("Corrupt container: padding bits are not zero")
+    canonical_codes = build_canonical_codes(dict(zip(alphabet, lengths)))
+    text = decode_packed(payload, canonical_codes, padding)
+    if len(text) != char_count or zlib.crc32(text.encode("utf-8")) != checksum:
+        raise ValueError("Checksum mismatch: compressed data is damaged")
+    return text
+
+def load_compressed_document(path):
+    return unpack_container(load_binary_file(path))
+
+# ==================== Streaming Block Compression ====================
+#
+# Stream layout: magic b"CSHS", version u8, then one record per block:
+#   u32 record size + a version 1 container (own code table and checksum) for that block
+# A record size of 0 marks the end of the stream, so a truncated file is detected
+# Only one block is held in memory at a time, whatever the size of the input
+
+STREAM_MAGIC = b"CSHS"
+STREAM_VERSION = 1
+STREAM_BLOCK_CHARS = 1 << 20
+
+#Creates an empty file next to path under an unused name; returns (file descriptor, temporary path)
+#Opened with mode 0o666 like any new file, so the umask gives it the permissions path would get
+#(mkstemp would make it private, and reading the umask means changing it for every thread)
+def create_temp_file(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    while True:
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+# The output is written to a temporary file next to dest_path and only renamed into place once it is
+# complete, so a failed or cancelled run never leaves a half-written file behind
+def _replace_on_success(dest_path, write):
+    fd, tmp_path = create_temp_file(dest_path)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            result = write(tmp)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return result
+
+#progress(done, total) is called once per block with the bytes read so far, if given
+def compress_file(source_path, dest_path, block_chars=STREAM_BLOCK_CHARS, progress=None):
+    return _replace_on_success(dest_path, lambda dst: _compress_stream(source_path, dst, block_chars, progress))
+
+def _compress_stream(source_path, dst, block_chars, progress):
+    original_size = 0
+    total = os.path.getsize(source_path)
+    # newline="" keeps \r\n as-is so decompression gives back the exact file
+    with open(source_path, "r", encoding="utf-8", newline="") as src:
+        dst.write(STREAM_MAGIC + struct.pack(">B", STREAM_VERSION))
+        while True:
+            block = src.read(block_chars)
+            if not block:
+                break
+            original_size += len(block.encode("utf-8"))
+            record = pack_container(block)
+            dst.write(struct.pack(">I", len(record)) + record)
+            if progress:
+                progress(original_size, total)
+        dst.write(struct.pack(">I", 0))
+        compressed_size = dst.tell()
+    return original_size, compressed_size
+
+# Yields the decompressed text one block at a time
+# progress(done, total) is called once per block with the compressed bytes read so far, if given
+def iter_decompressed_blocks(source_path, progress=None):
+    total = os.path.getsize(source_path)
+    with open(source_path, "rb") as src:
+        header = src.read(5)
+        if header[:4] != STREAM_MAGIC:
+            raise ValueError("Not a compressed stream (bad magic bytes)")
+        if len(header) < 5:
+            raise ValueError("Compressed stream is truncated")
+        if header[4] != STREAM_VERSION:
+            raise ValueError(f"Unsupported stream version {header[4]}")
+        while True:
+            size_bytes = src.read(4)
+            if len(size_bytes) < 4:
+                raise ValueError("Compressed stream is truncated")
+            (size,) = struct.unpack(">I", size_bytes)
+            if size == 0:
+                return
+            record = src.read(size)
+            if len(record) < size:
+                raise ValueError("Compressed stream is truncated")
+            if progress:
+                progress(src.tell(), total)
+            yield unpack_container(record)
+
+def decompress_file(source_path, dest_path, progress=None):
+    def write(dst):
+        for block in iter_decompressed_blocks(source_path, progress):
+            dst.write(block.encode("utf-8"))
+    _replace_on_success(dest_path, write)
+
 # ==================== GUI-Compatible Utility ====================
 
 def load_file_into_box(target_box):
+    # tkinter is imported here so the rest of this module works without a display
+    import tkinter as tk
+    from tkinter import filedialog
     file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
     if file_path:
         with open(file_path, "r", encoding="utf-8") as file:
@@ -0,0 +1,94 @@
+# Histogram and entropy statistics that predict how well a document compresses, without encoding it
+import math
+import os
+import struct
+from collections import Counter
+import tools.compression as compression
+
+try:
+    import numpy as np
+except ImportError:  # Counter does the same counting in one (slower) pass
+    np = None
+
+# {byte value: count} over raw bytes
+def byte_histogram(data):
+    if np is not None:
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        return {int(b): int(counts[b]) for b in np.flatnonzero(counts)}
+    return dict(Counter(data))
+
+# {character: count}; this is the alphabet the Huffman coder works on
+def char_histogram(text):
+    if np is not None:
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        counts = np.bincount(codepoints)
+        return {chr(int(c)): int(counts[c]) for c in np.flatnonzero(counts)}
+    return dict(Counter(text))
+
+# Shannon entropy in bits per symbol: the lower bound for any symbol-by-symbol code
+def shannon_entropy(histogram):
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    return -sum((count / total) * math.log2(count / total) for count in histogram.values() if count)
+
+# Exact payload size of the Huffman encoding, from the code lengths alone
+def predicted_huffman_bits(histogram):
+    if not histogram:
+        return 0
+    code_lengths = compression.build_code_lengths(histogram)
+    return sum(count * code_lengths[char] for char, count in histogram.items())
+
+# Size of the container header written by compression.build_container
+def container_header_size(histogram):
+    alphabet_bytes = len("".join(histogram).encode("utf-8"))
+    return len(compression.CONTAINER_MAGIC) + struct.calcsize(">BII") + alphabet_bytes + len(histogram) + struct.calcsize(">QQI")
+
+def compression_profile(text):
+    histogram = char_histogram(text)
+    original_size = len(text.encode("utf-8"))
+    payload_size = (predicted_huffman_bits(histogram) + 7) // 8
+    predicted_size = container_header_size(histogram) + payload_size
+    return {
+        "original_size": original_size,
+        "symbols": len(histogram),
+        "entropy": shannon_entropy(histogram),
+        "predicted_size": predicted_size,
+        "predicted_ratio": (100 - (predicted_size / original_size) * 100) if original_size else 0
+    }
+
+# Every file also gets byte_entropy (bits per raw byte). A file that is not UTF-8 text cannot be
+# Huffman-coded by compress_file, so it is profiled from its bytes alone and never worth compressing
+def profile_file(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    bytes_seen = byte_histogram(data)
+    byte_entropy = shannon_entropy(bytes_seen)
+    try:
+        profile = compression_profile(data.decode("utf-8"))  # bytes keep \r\n, like newline=""
+        profile["text"] = True
+    except UnicodeDecodeError:
+        profile = {
+            "original_size": len(data),
+            "symbols": len(bytes_seen),
+            "entropy": byte_entropy,
+            "predicted_size": len(data),
+            "predicted_ratio": 0,
+            "text": False
+        }
+    profile["byte_entropy"] = byte_entropy
+    profile["path"] = path
+    return profile
+
+# Profiles every .txt file in a folder, biggest predicted savings first
+# progress(done, total) is called once per file, if given
+def plan_folder(folder, min_ratio=10, progress=None):
+    profiles = []
+    filenames = [filename for filename in os.listdir(folder) if filename.endswith(".txt")]
+    for done, filename in enumerate(filenames):
+        if progress:
+            progress(done, len(filenames))
+        profile = profile_file(os.path.join(folder, filename))
+        profile["worth_compressing"] = profile["text"] and profile["predicted_ratio"] >= min_ratio
+        profiles.append(profile)
+    return sorted(profiles, key=lambda p: p["original_size"] - p["predicted_size"], reverse=True)
@@ -1,33 +1,177 @@
 # Goal is to find reachable cities from a source node via BFS (e.g. Trip Planner App)
-from collections import deque
+# CSRGraph stores a graph in CSR form: node names are interned to ids 0..n-1, and the neighbors of node i
+# are neighbors[offsets[i]:offsets[i + 1]] in two flat arrays, so millions of edges cost a few bytes each.
+# The module-level bfs/dfs below walk a dict adjacency directly instead
+from array import array
+from itertools import accumulate
 
+try:
+    import numpy as np
+except ImportError:  # the counting sort below does the same job in pure Python
+    np = None
+
+class CSRGraph:
+    def __init__(self, names, offsets, neighbors):
+        self.names = names  # node id -> name
+        self.ids = {name: i for i, name in enumerate(names)}  # name -> node id
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    # adjacency maps each node to its neighbors (dict-of-lists, or a networkx graph's .adj)
+    # Neighbor order is kept, so traversals visit nodes in the same order as on the original
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        ids = {}
+        names = []
+        for node in adjacency:
+            ids[node] = len(names)
+            names.append(node)
+        counts = array("Q", [0])
+        neighbors = array("I")
+        for node in list(names):
+            for neighbor in adjacency[node]:
+                i = ids.get(neighbor)
+                if i is None:
+                    i = ids[neighbor] = len(names)
+                    names.append(neighbor)
+                neighbors.append(i)
+            counts.append(len(neighbors))
+        # Nodes only seen as neighbors have no edges of their own
+        counts.extend([len(neighbors)] * (len(names) + 1 - len(counts)))
+        return cls(names, counts, neighbors)
+
+    # edges: iterable of (u, v); each undirected edge is stored in both directions
+    @classmethod
+    def from_edges(cls, edges, directed=False):
+        ids = {}
+        intern = ids.setdefault  # a new name gets the next id
+        sources = array("I")
+        targets = array("I")
+        add_source, add_target = sources.append, targets.append
+        for u, v in edges:
+            i = intern(u, len(ids))
+            j = intern(v, len(ids))
+            add_source(i)
+            add_target(j)
+            if not directed:
+                add_source(j)
+                add_target(i)
+        names = list(ids)
+
+        # Stable sort of the edges by source, so each node's neighbors stay in edge order
+        offsets = array("Q")
+        neighbors = array("I")
+        if np is not None:
+            source_ids = np.frombuffer(sources, dtype=np.uint32)
+            order = np.argsort(source_ids, kind="stable")
+            neighbors.frombytes(np.frombuffer(targets, dtype=np.uint32)[order].tobytes())
+            counts = np.bincount(source_ids, minlength=len(names))
+            offsets.frombytes(np.concatenate(([0], np.cumsum(counts))).astype(np.uint64).tobytes())
+        else:
+            # Counting sort
+            counts = array("Q", bytes(8 * (len(names) + 1)))
+            for s in sources:
+                counts[s + 1] += 1
+            offsets = array("Q", accumulate(counts))
+            fill = offsets[:-1]
+            neighbors = array("I", bytes(4 * len(targets)))
+            for s, t in zip(sources, targets):
+                neighbors[fill[s]] = t
+                fill[s] += 1
+        return cls(names, offsets, neighbors)
+
+    def __len__(self):
+        return len(self.names)
+
+    def edge_count(self):
+        return len(self.neighbors)
+
+    def neighbors_of(self, node_id):
+        return self.neighbors[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def node_names(self, order):
+        return [self.names[i] for i in order]
+
+    # Breadth-first order of the node ids reachable from start (a name); the order array doubles as the queue
+    def bfs(self, start):
+        offsets, neighbors = self.offsets, self.neighbors
+        visited = bytearray(len(self.names))
+        first = self.ids[start]
+        visited[first] = 1
+        order = array("I", [first])
+        head = 0
+        while head < len(order):
+            node = order[head]
+            head += 1
+            for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    order.append(neighbor)
+        return order
+
+    # Depth-first preorder, the same order as the recursive version but with an explicit stack
+    # of (node, next edge to try), so deep chains never hit the recursion limit
+    def dfs(self, start):
+        offsets, neighbors = self.offsets, self.neighbors
+        visited = bytearray(len(self.names))
+        first = self.ids[start]
+        visited[first] = 1
+        order = array("I", [first])
+        stack_nodes = array("I", [first])
+        stack_edges = array("Q", [offsets[first]])
+        while stack_nodes:
+            node = stack_nodes[-1]
+            edge = stack_edges[-1]
+            end = offsets[node + 1]
+            while edge < end and visited[neighbors[edge]]:
+                edge += 1
+            if edge == end:
+                stack_nodes.pop()
+                stack_edges.pop()
+                continue
+            stack_edges[-1] = edge + 1
+            neighbor = neighbors[edge]
+            visited[neighbor] = 1
+            order.append(neighbor)
+            stack_nodes.append(neighbor)
+            stack_edges.append(offsets[neighbor])
+        return order
+
+# Traversals straight on a dict-of-lists (or dict-of-dicts) graph; both return the visited cities in order
+# They only touch the part of the graph they reach, so a graph that keeps changing needs no conversion
 def bfs(graph, start):
-    visited = set()  # Set to track visited cities
-    queue = deque([start])  # Queue for BFS starting from the given city
-    print("\nBFS Traversal Order:")
-    while queue:
-        city = queue.popleft()  # Dequeue a city
-        if city not in visited:
-            print(city, end=" ")  # Printing visited cities
-            visited.add(city)  # Marking as a visited city
-            for neighbor in graph.get(city, []):  # Traverse neighbors
-                if neighbor not in visited:
-                    queue.append(neighbor)
-
-# Define the DFS function using recursion
-def dfs(graph, node, visited=None):
-    if visited is None:
-        visited = set()
-    if node not in visited:
-        print(node)
-        visited.add(node)
-        for neighbor in graph.get(node, []):
-            dfs(graph, neighbor, visited)  # Recursive DFS call for the neighbor
+    visited = {start}
+    order = [start]
+    head = 0
+    while head < len(order):
+        city = order[head]
+        head += 1
+        for neighbor in graph.get(city, ()):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                order.append(neighbor)
+    return order
+
+# Same preorder as the recursive version; the stack holds one neighbor iterator per open node
+def dfs(graph, node):
+    visited = {node}
+    order = [node]
+    stack = [iter(graph.get(node, ()))]
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                order.append(neighbor)
+                stack.append(iter(graph.get(neighbor, ())))
+                break
+        else:
+            stack.pop()
+    return order
 
 # Main block of code
 if __name__ == "__main__":
     graph = {}
-    
+
     # For BFS
     print("Enter number of Connections:")
     edges = int(input())
@@ -43,7 +187,8 @@ if __name__ == "__main__":
 
     print("Enter starting city for BFS:")
     start_city = input()
-    bfs(graph, start_city)
+    print("\nBFS Traversal Order:")
+    print(" ".join(bfs(graph, start_city)))
 
     # For DFS
     graph = {}
@@ -63,4 +208,4 @@ if __name__ == "__main__":
     print("Enter the starting node for DFS Traversal:")
     start_node = input()
     print("\nDFS Traversal Order:")
-    dfs(graph, start_node)
+    print("\n".join(dfs(graph, start_node)))
@@ -0,0 +1,66 @@
+# Positional inverted index so a word or exact phrase can be searched across a whole folder at once
+import os
+import re
+import sys
+
+WORD_RE = re.compile(r"\w+")
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+#Step 1: Build the index once; postings map each word to {document: [word positions]}
+def build_index(documents):
+    postings = {}
+    for name, text in documents.items():
+        add_document(postings, name, text)
+    return postings
+
+def add_document(postings, name, text):
+    for position, word in enumerate(tokenize(text)):
+        postings.setdefault(word, {}).setdefault(name, []).append(position)
+
+#progress(done, total) is called once per file, if given
+#Files are decoded like the scan cache does (bad bytes become U+FFFD) and unreadable ones are skipped,
+#so one odd file never leaves the whole folder unindexed
+def index_folder(folder, progress=None):
+    postings = {}
+    filenames = [filename for filename in os.listdir(folder) if filename.endswith(".txt")]
+    for done, filename in enumerate(filenames):
+        if progress:
+            progress(done, len(filenames))
+        try:
+            with open(os.path.join(folder, filename), "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Error reading {filename}: {e}", file=sys.stderr)
+            continue
+        add_document(postings, filename, text)
+    return postings
+
+#Step 2: Answer a word or phrase query; returns {document: number of hits}
+def search_index(postings, query):
+    terms = tokenize(query)
+    if not terms:
+        return {}
+    lists = [postings.get(term) for term in terms]
+    if not all(lists):
+        return {}
+    if len(terms) == 1:
+        return {name: len(positions) for name, positions in lists[0].items()}
+
+    # Only documents containing every word can hold the phrase; start from the rarest word
+    candidates = set(min(lists, key=len))
+    for doc_postings in lists:
+        candidates.intersection_update(doc_postings)
+
+    hits = {}
+    for name in candidates:
+        # The phrase starts at p if word i of the query sits at p + i for every i
+        starts = set(lists[0][name])
+        for offset in range(1, len(terms)):
+            starts.intersection_update(p - offset for p in lists[offset][name])
+            if not starts:
+                break
+        if starts:
+            hits[name] = len(starts)
+    return hits
@@ -0,0 +1,49 @@
+# Runs long tasks on a background thread so the GUI stays responsive
+# The task gets a progress(done, total) callback; calling it after cancel() raises JobCancelled,
+# which is how a running task is stopped at its next progress report
+import threading
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.done = 0
+        self.total = 0
+        self.state = "pending"  # pending -> running -> done / cancelled / error
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.state = "running"
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def report(self, done, total):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.done, self.total = done, total
+
+    def finished(self):
+        return self.state in ("done", "cancelled", "error")
+
+    def _run(self):
+        try:
+            result = self.func(*self.args, progress=self.report, **self.kwargs)
+            # Cancelled after its last progress report: the caller no longer wants the result
+            self.report(self.done, self.total)
+            self.result = result
+            self.state = "done"
+        except JobCancelled:
+            self.state = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.state = "error"
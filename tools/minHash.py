@@ -0,0 +1,87 @@
+# MinHash signatures + LSH banding to find similar documents without comparing every pair
+from tools.searchTools import word_hash
+
+NUM_PERM = 128
+
+#Step 1: MinHash signature of a set of words
+#One-permutation hashing: every word is hashed once, the hash picks one of num_perm bins
+#and each bin keeps its minimum, so the cost is O(words) instead of O(words x num_perm)
+def minhash_signature(words, num_perm=NUM_PERM):
+    bins = [None] * num_perm
+    for word in words:
+        h = word_hash(word)
+        b = h % num_perm
+        value = h // num_perm
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return None
+
+    # Densification: an empty bin borrows the next filled bin to its right (wrapping around),
+    # offset by the distance so two documents only agree if they borrowed from the same place
+    offset = (1 << 64) // num_perm + 1
+    signature = list(bins)
+    nxt = filled[0] + num_perm
+    for i in range(num_perm - 1, -1, -1):
+        if bins[i] is not None:
+            nxt = i
+        else:
+            signature[i] = bins[nxt % num_perm] + (nxt - i) * offset
+    return tuple(signature)
+
+#Fraction of matching slots is an estimate of the Jaccard similarity
+def estimate_jaccard(sig1, sig2):
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+def jaccard(words1, words2):
+    union = len(words1) + len(words2) - len(words1 & words2)
+    return len(words1 & words2) / union if union else 0
+
+#Step 2: Pick bands x rows so a pair right at the threshold becomes a candidate with high probability
+#More rows per band means fewer false candidates, so keep the largest row count that still meets the recall
+def choose_bands(threshold, num_perm=NUM_PERM, recall=0.95):
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+#Step 3: Hash each band of every signature into buckets; documents sharing a bucket are candidates
+def build_lsh_index(signatures, bands, rows):
+    buckets = [{} for _ in range(bands)]
+    for doc, sig in signatures.items():
+        for band in range(bands):
+            key = sig[band * rows:(band + 1) * rows]
+            buckets[band].setdefault(key, []).append(doc)
+    return buckets
+
+def candidate_pairs(buckets):
+    pairs = set()
+    for band_buckets in buckets:
+        for docs in band_buckets.values():
+            for i in range(len(docs)):
+                for j in range(i + 1, len(docs)):
+                    pairs.add((docs[i], docs[j]))
+    return pairs
+
+#Returns (doc1, doc2, jaccard) once per pair whose exact Jaccard similarity reaches the threshold
+#Signatures that are already known (e.g. from the scan cache) can be passed in and are not recomputed
+def similarity_edges(doc_words, threshold=0.3, num_perm=NUM_PERM, known_signatures=None):
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Jaccard threshold must be greater than 0 and at most 1, got {threshold}")
+    known_signatures = known_signatures or {}
+    signatures = {}
+    for doc, words in doc_words.items():
+        sig = known_signatures.get(doc) or minhash_signature(words, num_perm)
+        if sig is not None:  # empty documents have nothing to compare
+            signatures[doc] = sig
+
+    bands, rows = choose_bands(threshold, num_perm)
+    edges = []
+    for doc1, doc2 in sorted(candidate_pairs(build_lsh_index(signatures, bands, rows))):
+        similarity = jaccard(doc_words[doc1], doc_words[doc2])
+        if similarity >= threshold:
+            edges.append((doc1, doc2, similarity))
+    return edges
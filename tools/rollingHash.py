@@ -0,0 +1,109 @@
+# Vectorized Rabin-Karp: every window hash of a text in one NumPy pass, many patterns at once
+# Hashes are polynomials mod 2^64, so uint64 arithmetic wraps into the modulus for free; a window
+# only becomes a candidate when its 64-bit hash equals a pattern's, and candidates are still
+# checked character by character, so a collision can cost time but never a wrong match
+import tools.searchTools as search
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # fall back to the pure Python rabin_karp, one pattern at a time
+    np = None
+
+MASK64 = (1 << 64) - 1
+HASH_BASE = 1099511628211  # odd, so it has an inverse mod 2^64
+HASH_BASE_INV = pow(HASH_BASE, -1, 1 << 64)
+VERIFY_CHUNK = 1 << 16  # candidate windows compared per batch, bounds the temporary matrix
+FILTER_BITS = 16  # top hash bits looked up in a small table before the exact hash comparison
+
+#One code point per character, so array offsets are the same as string offsets
+def text_codes(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+#hash(s) = sum(ord(s[k]) * base^k) mod 2^64
+def pattern_hash(pattern):
+    h = 0
+    power = 1
+    for char in pattern:
+        h = (h + ord(char) * power) & MASK64
+        power = (power * HASH_BASE) & MASK64
+    return h
+
+#Prefix sums of codes[j] * base^j and the inverse powers base^-i, built once per text
+def prefix_hashes(codes):
+    powers = np.full(len(codes), HASH_BASE, dtype=np.uint64)
+    powers[:1] = 1
+    prefix = np.zeros(len(codes) + 1, dtype=np.uint64)
+    np.cumsum(codes * np.cumprod(powers), out=prefix[1:])
+    inverse = np.full(len(codes), HASH_BASE_INV, dtype=np.uint64)
+    inverse[:1] = 1
+    return prefix, np.cumprod(inverse)
+
+#Hash of every length-m window: (prefix[i + m] - prefix[i]) * base^-i, two array operations
+def window_hashes(prefix, inverse, m):
+    count = len(prefix) - m
+    return (prefix[m:] - prefix[:count]) * inverse[:count]
+
+#Returns {pattern: positions} for every pattern found in text, like aho_corasick_search
+#Patterns are grouped by length; each length costs one pass over the prefix hashes
+#progress(done, total) is called once per length group, if given
+def search_patterns(text, patterns, progress=None):
+    by_length = {}
+    for pattern in set(patterns):
+        if pattern:
+            by_length.setdefault(len(pattern), []).append(pattern)
+
+    positions = {}
+    if np is None:
+        total = sum(len(group) for group in by_length.values())  # counted once, not per report
+        for done, pattern in enumerate(p for group in by_length.values() for p in group):
+            if progress and done % 10 == 0:
+                progress(done, total)
+            found = search.rabin_karp(text, pattern)
+            if found:
+                positions[pattern] = found
+        return positions
+
+    codes = text_codes(text)
+    prefix, inverse = prefix_hashes(codes)
+    for done, (m, group) in enumerate(sorted(by_length.items())):
+        if progress:
+            progress(done, len(by_length))
+        if m > len(codes):
+            continue
+
+        group_hashes = np.array([pattern_hash(pattern) for pattern in group], dtype=np.uint64)
+        order = np.argsort(group_hashes)
+        sorted_hashes = group_hashes[order]
+        if len(group) > 1 and (sorted_hashes[1:] == sorted_hashes[:-1]).any():
+            # Two patterns share a hash: search them one by one instead
+            for pattern in group:
+                found = search.kmp_search(text, pattern)
+                if found:
+                    positions[pattern] = found
+            continue
+
+        # Candidates: windows whose hash equals some pattern's hash. A table lookup on the top
+        # bits rules out almost every window, so the binary search only sees a few of them
+        hashes = window_hashes(prefix, inverse, m)
+        shift = np.uint64(64 - FILTER_BITS)
+        table = np.zeros(1 << FILTER_BITS, dtype=bool)
+        table[sorted_hashes >> shift] = True
+        candidates = np.flatnonzero(table[hashes >> shift])
+        slots = np.minimum(np.searchsorted(sorted_hashes, hashes[candidates]), len(group) - 1)
+        exact = sorted_hashes[slots] == hashes[candidates]
+        candidates = candidates[exact]
+        if not len(candidates):
+            continue
+        which = order[slots[exact]]
+
+        # Bulk verification: compare candidate windows with their pattern's code points in one go
+        group_codes = np.array([[ord(char) for char in pattern] for pattern in group], dtype=np.uint64)
+        windows = sliding_window_view(codes, m)
+        for start in range(0, len(candidates), VERIFY_CHUNK):
+            chunk = candidates[start:start + VERIFY_CHUNK]
+            chunk_which = which[start:start + VERIFY_CHUNK]
+            ok = (windows[chunk] == group_codes[chunk_which]).all(axis=1)
+            for index, pos in zip(chunk_which[ok].tolist(), chunk[ok].tolist()):
+                positions.setdefault(group[index], []).append(pos)
+    return positions
@@ -0,0 +1,192 @@
+# On-disk cache for folder scans so unchanged files are never re-read or re-tokenized
+import gc
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+from datetime import datetime
+from tools.minHash import minhash_signature
+from tools.citationGraph import extract_citations
+
+CACHE_VERSION = 3  # 2: entries carry citations; 3: SQLite, one row per file
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".csuf_scanner")
+
+#Author/Title/Date are read from the first 3 lines of a document
+def parse_metadata(text):
+    author = title = date_str = "Unknown"
+    for line in text.split("\n", 3)[:3]:
+        line = line.strip()
+        if line.lower().startswith("author:"):
+            author = line.split(":", 1)[1].strip()
+        elif line.lower().startswith("title:"):
+            title = line.split(":", 1)[1].strip()
+        elif line.lower().startswith("date:"):
+            date_str = line.split(":", 1)[1].strip()
+    try:
+        date_obj = datetime.strptime(date_str, "%B %d, %Y")
+    except ValueError:
+        date_obj = None
+    return {
+        "author": author,
+        "title": title,
+        "date": date_obj,
+        "date_str": date_str,
+        "year": date_obj.year if date_obj else 0
+    }
+
+#Everything the GUI derives from a file's contents
+def analyze_text(text):
+    words = set(text.lower().split())
+    return {
+        "metadata": parse_metadata(text),
+        "words": words,
+        "signature": minhash_signature(words),
+        "citations": extract_citations(text)
+    }
+
+def cache_path(folder, cache_dir=CACHE_DIR):
+    key = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"scan_{key}.sqlite")
+
+# One row per file in each table: the small metadata rows are all the Sorting page reads, and word sets
+# and signatures are only loaded for callers that ask for them (words as newline-separated text, which
+# splits back into a set much faster than a pickled set loads). SQLite's locking lets two pages scan the
+# same folder at once, and a scan only writes the rows of files that changed
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha256 TEXT, summary BLOB);
+CREATE TABLE IF NOT EXISTS features (name TEXT PRIMARY KEY, words TEXT, signature BLOB);
+"""
+
+def open_cache(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        return _connect(path)
+    except sqlite3.DatabaseError:  # damaged or not a cache file: start over
+        os.remove(path)
+        return _connect(path)
+
+def _connect(path):
+    db = sqlite3.connect(path, timeout=30)
+    try:
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            if version:
+                db.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS features;")
+            db.executescript(SCHEMA + f"PRAGMA user_version = {CACHE_VERSION};")
+        db.execute("PRAGMA journal_mode = WAL")  # readers are not blocked while another scan writes
+    except sqlite3.DatabaseError:
+        db.close()
+        raise
+    return db
+
+#Any row that cannot be read back is treated as a cache miss
+def _unpickle(blob):
+    try:
+        return pickle.loads(blob)
+    except Exception:
+        return None
+
+def _dumps(value):
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+#Returns {filename: entry} for every .txt file in the folder
+#A file is only read again when its size or mtime changed, and only re-analyzed when its content hash changed
+#features=False leaves out "words" and "signature", for callers that only need metadata and citations
+#progress(done, total) is called once per file, if given
+def scan_folder(folder, cache_dir=CACHE_DIR, progress=None, features=True):
+    db = open_cache(cache_path(folder, cache_dir))
+    try:
+        cached = {}
+        for name, size, mtime, digest, summary in db.execute("SELECT name, size, mtime, sha256, summary FROM files"):
+            summary = _unpickle(summary)
+            if isinstance(summary, dict):
+                cached[name] = dict(summary, size=size, mtime=mtime, sha256=digest)
+
+        entries = {}
+        analyzed = []  # new or edited files: both rows are written
+        touched = []  # same content, new stat key
+        filenames = [filename for filename in os.listdir(folder) if filename.endswith(".txt")]
+        for done, filename in enumerate(filenames):
+            if progress:
+                progress(done, len(filenames))
+            entry = cached.get(filename)
+            try:
+                stat = os.stat(os.path.join(folder, filename))
+                if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+                    entries[filename] = entry
+                    continue
+                data = _read(os.path.join(folder, filename))
+            except OSError as e:
+                print(f"Error reading {filename}: {e}", file=sys.stderr)  # stdout is the CLI's JSON output
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry["sha256"] == digest:
+                # Touched but not edited: keep the analysis, refresh the stat key
+                entry = dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns)
+                touched.append((stat.st_size, stat.st_mtime_ns, filename))
+            else:
+                entry = analyze_text(decode_text(data))
+                entry.update(size=stat.st_size, mtime=stat.st_mtime_ns, sha256=digest)
+                analyzed.append(filename)
+            entries[filename] = entry
+
+        if features:
+            missing = [name for name in entries if "words" not in entries[name]]
+            if missing:
+                # Millions of word strings are created here; with the collector paused it does not
+                # rescan them over and over while they are being loaded
+                collecting = gc.isenabled()
+                gc.disable()
+                try:
+                    for name, words, signature in db.execute("SELECT name, words, signature FROM features"):
+                        if name in entries and "words" not in entries[name]:
+                            signature = _unpickle(signature)
+                            if isinstance(words, str) and isinstance(signature, (tuple, type(None))):
+                                entries[name].update(words=set(words.split("\n")) if words else set(), signature=signature)
+                finally:
+                    if collecting:
+                        gc.enable()
+                # A lost features row is rebuilt from the file
+                for name in missing:
+                    if "words" not in entries[name]:
+                        try:
+                            data = _read(os.path.join(folder, name))
+                        except OSError as e:
+                            print(f"Error reading {name}: {e}", file=sys.stderr)  # stdout is the CLI's JSON output
+                            del entries[name]
+                            continue
+                        entries[name].update(analyze_text(decode_text(data)))
+                        analyzed.append(name)
+
+        removed = [(name,) for name in cached if name not in entries]
+        if analyzed or touched or removed:
+            with db:
+                db.executemany("UPDATE files SET size = ?, mtime = ? WHERE name = ?", touched)
+                db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", [
+                    (name, entries[name]["size"], entries[name]["mtime"], entries[name]["sha256"],
+                     _dumps({"metadata": entries[name]["metadata"], "citations": entries[name]["citations"]}))
+                    for name in analyzed])
+                db.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?)", [
+                    (name, "\n".join(entries[name]["words"]), _dumps(entries[name]["signature"])) for name in analyzed])
+                db.executemany("DELETE FROM files WHERE name = ?", removed)
+                db.executemany("DELETE FROM features WHERE name = ?", removed)
+    finally:
+        db.close()
+
+    if not features:
+        for entry in entries.values():
+            entry.pop("words", None)
+            entry.pop("signature", None)
+    return entries
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def decode_text(data):
+    return data.decode("utf-8", errors="replace")  # a stray Latin-1 byte must not drop the whole file
+
+#The text scan_folder analyzes for a file, for callers that skip the cache; raises OSError
+def read_document(path):
+    return decode_text(_read(path))
@@ -1,3 +1,7 @@
+from collections import deque
+import hashlib
+import re
+
 # rabin karp and kmp algorithms to detect duplicated phrases or plagarized content
 
 #Rabin-Karp String Matching Algorithm
@@ -9,9 +13,11 @@ def rabin_karp(text, pattern, q=101):
     p_hash = 0
     t_hash = 0
     positions = [] # storing the indices of the pattern found
+    if m == 0 or m > n:
+        return positions
     #Step 1: Calculate initial hash of Pattern & First window of the Text
     for i in range(m):
-        _hash = (d * p_hash + ord(pattern[i])) % q
+        p_hash = (d * p_hash + ord(pattern[i])) % q
         t_hash = (d * t_hash + ord(text[i])) % q
     #Step 2: Slide the pattern over the text one character at a time
     for i in range(n - m + 1):
@@ -101,3 +107,298 @@ pattern = "computer"
 
 #provide output
 #print("Naive string match found at: ", naive_seach(text,pattern))
+
+
+#Aho-Corasick Multi-Pattern Matching Algorithm
+#Step 1: Build a trie of every pattern, then add failure links with a BFS
+def build_aho_corasick(patterns):
+    goto = [{}] # goto[state] maps a character to the next state
+    fail = [0] # longest proper suffix of the state that is also in the trie
+    terminal = [None] # pattern that ends exactly at this state
+    dict_link = [0] # nearest state on the failure chain that ends a pattern
+    for pattern in patterns:
+        if not pattern:
+            continue
+        state = 0
+        for char in pattern:
+            nxt = goto[state].get(char)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][char] = nxt
+                goto.append({})
+                fail.append(0)
+                terminal.append(None)
+                dict_link.append(0)
+            state = nxt
+        terminal[state] = pattern
+
+    queue = deque(goto[0].values()) # depth 1 states already fail to the root
+    while queue:
+        state = queue.popleft()
+        for char, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and char not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(char, 0)
+            link = fail[nxt]
+            dict_link[nxt] = link if terminal[link] is not None else dict_link[link]
+    return goto, fail, terminal, dict_link
+
+#Step 2: Walk the text once and report every pattern that ends at each character
+def aho_corasick_search(text, patterns):
+    goto, fail, terminal, dict_link = build_aho_corasick(patterns)
+    positions = {pattern: [] for pattern in patterns if pattern}
+    state = 0
+    for i, char in enumerate(text):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        match = state if terminal[state] is not None else dict_link[state]
+        while match:
+            pattern = terminal[match]
+            positions[pattern].append(i - len(pattern) + 1)
+            match = dict_link[match]
+    return {pattern: found for pattern, found in positions.items() if found}
+
+#Example Input:
+text = "Hello World! this is Computer Science"
+patterns = ["Computer", "Science", "this is"]
+#Output
+#print("Aho-Corasick matches found at:", aho_corasick_search(text, patterns))
+
+
+
+#Word-Shingle Fingerprinting (k-word windows hashed with a 64-bit rolling hash)
+MASK64 = (1 << 64) - 1
+SHINGLE_BASE = 1099511628211 # odd 64-bit multiplier for the rolling hash
+
+#Stable 64-bit hash of a single word so fingerprints are the same on every run
+def word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+
+#Returns one hash per k-word window, rolling the hash forward one word at a time
+def shingle_hashes(words, k=4):
+    if len(words) < k:
+        return []
+    cache = {}
+    word_values = []
+    for word in words:
+        value = cache.get(word)
+        if value is None:
+            value = cache[word] = word_hash(word)
+        word_values.append(value)
+
+    high = pow(SHINGLE_BASE, k - 1, 1 << 64) # weight of the word leaving the window
+    h = 0
+    for i in range(k):
+        h = (h * SHINGLE_BASE + word_values[i]) & MASK64
+    hashes = [h]
+    for i in range(k, len(word_values)):
+        h = ((h - word_values[i - k] * high) * SHINGLE_BASE + word_values[i]) & MASK64
+        hashes.append(h)
+    return hashes
+
+#Compares two documents in O(n + m) using the intersection of their shingle hashes
+def shingle_similarity(text1, text2, k=4):
+    words1 = text1.split()
+    spans2 = [m.span() for m in re.finditer(r"\S+", text2)]
+    words2 = [text2[start:end] for start, end in spans2]
+    hashes1 = shingle_hashes(words1, k)
+    hashes2 = shingle_hashes(words2, k)
+
+    # Every window start of text2 grouped by its hash
+    windows2 = {}
+    for j, h in enumerate(hashes2):
+        windows2.setdefault(h, []).append(j)
+    shared = set(hashes1).intersection(windows2)
+
+    matches = []
+    verified = {} # phrase -> character positions in text2, checked word by word
+    for i, h in enumerate(hashes1):
+        if h not in shared:
+            continue
+        phrase = " ".join(words1[i:i + k])
+        if phrase not in verified:
+            # Verify step: drop hash collisions and windows whose words are not separated by single
+            # spaces. Matches are whole words only: unlike the KMP/Boyer-Moore/Aho-Corasick checks,
+            # which find a phrase anywhere in text2 ("fox jump" inside "fox jumps", "the" inside
+            # "ethe"), a shingle match never starts or ends inside a word of text2. So these matches
+            # are a subset of theirs and the similarity percentage can be lower, never higher
+            verified[phrase] = [spans2[j][0] for j in windows2[h]
+                                if text2[spans2[j][0]:spans2[j + k - 1][1]] == phrase]
+        if verified[phrase]:
+            matches.append((phrase, verified[phrase]))
+
+    total_checked = len(hashes1)
+    similarity_percent = (len(matches) / total_checked) * 100 if total_checked else 0
+    return matches, similarity_percent
+
+#Example Input:
+text1 = "the quick brown fox jumps over the lazy dog"
+text2 = "a quick brown fox jumps over a sleeping dog"
+#Output
+#print("Shingle matches:", shingle_similarity(text1, text2))
+
+
+
+#Suffix Automaton over the words of a document
+#Every substring (run of consecutive words) of seq is a path from state 0; states are built online in O(n)
+def build_suffix_automaton(seq):
+    trans = [{}] # trans[state] maps a word to the next state
+    link = [-1] # suffix link: state of the longest suffix that ends in more places
+    length = [0] # longest word run that reaches this state
+    first_end = [-1] # index in seq where the runs of this state first end
+    last = 0
+    for i, word in enumerate(seq):
+        cur = len(length)
+        trans.append({})
+        link.append(0)
+        length.append(length[last] + 1)
+        first_end.append(i)
+        p = last
+        while p != -1 and word not in trans[p]:
+            trans[p][word] = cur
+            p = link[p]
+        if p != -1:
+            q = trans[p][word]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                # Split q so that the shorter runs get their own state
+                clone = len(length)
+                trans.append(dict(trans[q]))
+                link.append(link[q])
+                length.append(length[p] + 1)
+                first_end.append(first_end[q])
+                while p != -1 and trans[p].get(word) == q:
+                    trans[p][word] = clone
+                    p = link[p]
+                link[q] = link[cur] = clone
+        last = cur
+    return trans, link, length, first_end
+
+#Maximal common passages: runs of at least min_words words of text1 that also appear in text2
+#and cannot be extended on either side. Linear in the length of both texts
+#Returns (passages, similarity_percent) where passages is a list of
+#(start1, end1, start2, end2) character offsets into text1 and text2, in text1 order;
+#text2 offsets are the first place the passage occurs there
+def common_passages(text1, text2, min_words=4):
+    spans1 = [m.span() for m in re.finditer(r"\S+", text1)]
+    spans2 = [m.span() for m in re.finditer(r"\S+", text2)]
+    words1 = [text1[start:end] for start, end in spans1]
+    words2 = [text2[start:end] for start, end in spans2]
+    trans, link, length, first_end = build_suffix_automaton(words2)
+
+    # Walk text1 through the automaton, keeping the longest run of words ending here that text2 contains
+    runs = []
+    state = matched = 0
+    for word in words1:
+        while state and word not in trans[state]:
+            state = link[state]
+            matched = length[state]
+        if word in trans[state]:
+            state = trans[state][word]
+            matched += 1
+        else:
+            matched = 0
+        runs.append((matched, state))
+
+    passages = []
+    for i, (matched, state) in enumerate(runs):
+        # A run is maximal when the next word does not extend it
+        if matched >= min_words and (i + 1 == len(runs) or runs[i + 1][0] != matched + 1):
+            end2 = first_end[state]
+            passages.append((spans1[i - matched + 1][0], spans1[i][1], spans2[end2 - matched + 1][0], spans2[end2][1]))
+
+    # Share of text1's min_words-word windows that lie inside a copied run. Runs are made of whole
+    # words and ignore whitespace, so unlike the phrase checks (which look for the words joined by
+    # single spaces) a phrase split by a line break or double space in text2 still counts, and one
+    # found only inside longer words ("fox jump" in "fox jumps") does not. The percentage can
+    # therefore differ from the other algorithms' on the same pair (27.12% vs 20.34% on
+    # documents/doc1.txt and doc2.txt, where doc2 wraps lines mid-phrase)
+    total_checked = len(words1) - min_words + 1
+    copied = sum(1 for matched, _ in runs if matched >= min_words)
+    similarity_percent = (copied / total_checked) * 100 if total_checked > 0 else 0
+    return passages, similarity_percent
+
+#Example Input:
+text1 = "the quick brown fox jumps over the lazy dog"
+text2 = "a quick brown fox jumps over a sleeping dog"
+#Output
+#print("Common passages:", common_passages(text1, text2))
+
+
+
+#Plagiarism check shared by the GUI and the command line
+PLAGIARISM_ALGORITHMS = ["KMP", "Rabin-Karp", "Aho-Corasick", "Shingle Hash", "Suffix Automaton"]
+
+#Every phrase_len-word phrase of text1 is looked up in text2
+#Returns (matches, similarity_percent) where matches is a list of (phrase, positions)
+#progress(done, total) is called as phrases are checked, if given
+def find_matching_phrases(text1, text2, algo="KMP", phrase_len=4, progress=None):
+    words = text1.split()
+    phrases = [" ".join(words[i:i + phrase_len]) for i in range(len(words) - phrase_len + 1)]
+
+    matches = []
+    if algo == "Rabin-Karp":
+        # All window hashes of the comparison text at once, one pass per phrase length
+        import tools.rollingHash as rolling_hash  # imported here so NumPy only loads when Rabin-Karp runs
+        found_all = rolling_hash.search_patterns(text2, phrases, progress)
+        for phrase in phrases:
+            if phrase in found_all:
+                matches.append((phrase, found_all[phrase]))
+    elif algo == "Aho-Corasick":
+        # One pass over the comparison text finds every phrase at once
+        found_all = aho_corasick_search(text2, phrases)
+        for phrase in phrases:
+            if phrase in found_all:
+                matches.append((phrase, found_all[phrase]))
+    elif algo == "Shingle Hash":
+        # Hash every window of both texts and intersect the hash sets
+        matches, _ = shingle_similarity(text1, text2, k=phrase_len)
+    elif algo == "Suffix Automaton":
+        matches, _, similarity_percent = _passage_report(text1, text2, phrase_len, progress)
+        return matches, similarity_percent
+    else:
+        for i, phrase in enumerate(phrases):
+            if progress and i % 10 == 0:
+                progress(i, len(phrases))
+            found = kmp_search(text2, phrase)
+            if found:
+                matches.append((phrase, found))
+
+    total_checked = len(phrases)
+    if progress:
+        progress(total_checked, total_checked)
+    similarity_percent = (len(matches) / total_checked) * 100 if total_checked else 0
+    return matches, similarity_percent
+
+#Where find_matching_phrases' matches are: one (start1, end1, start2, end2) per matched phrase of text1,
+#in the format of common_passages; start2 is the phrase's first position in text2
+def match_spans(text1, matches, phrase_len=4):
+    first = {phrase: positions[0] for phrase, positions in matches}
+    spans = [m.span() for m in re.finditer(r"\S+", text1)]
+    passages = []
+    for i in range(len(spans) - phrase_len + 1):
+        phrase = " ".join(text1[start:end] for start, end in spans[i:i + phrase_len])
+        if phrase in first:
+            passages.append((spans[i][0], spans[i + phrase_len - 1][1], first[phrase], first[phrase] + len(phrase)))
+    return passages
+
+#Suffix Automaton as a plagiarism check: one match per maximal copied passage instead of one
+#per overlapping phrase; returns (matches, passages, similarity_percent)
+def _passage_report(text1, text2, phrase_len, progress):
+    passages, similarity_percent = common_passages(text1, text2, phrase_len)
+    if progress:
+        progress(1, 1)
+    matches = [(text1[start1:end1], [start2]) for start1, end1, start2, _ in passages]
+    return matches, passages, similarity_percent
+
+#The chosen algorithm's matches, their spans and the similarity, from one pass of that algorithm
+#Suffix Automaton reports maximal passages, the other algorithms one span per matched phrase
+def plagiarism_report(text1, text2, algo="KMP", phrase_len=4, progress=None):
+    if algo == "Suffix Automaton":
+        return _passage_report(text1, text2, phrase_len, progress)
+    matches, similarity_percent = find_matching_phrases(text1, text2, algo, phrase_len, progress)
+    return matches, match_spans(text1, matches, phrase_len), similarity_percent
@@ -1,45 +1,160 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
 from datetime import datetime
 
+MIN_RUN = 64  # runs this short are built by binary insertion before merging starts
+RADIX_BITS = 16  # bits per radix sort pass
+RADIX_MASK = (1 << RADIX_BITS) - 1
+NUMPY_MIN_ROWS = 10000  # below this, the pure Python radix sort is faster than loading NumPy
+
+# Sort keys for the metadata fields; dates without a value sort first
+def field_key(field):
+    if field == "date":
+        return lambda x: x["date"] or datetime.min
+    return lambda x: x[field].lower()
+
+#Stable sort of arr by key, returning a new list
+#key is one function, or a list of them for multi-key order (e.g. author, then date)
+#Each key is computed once per item, then merge_sort_indices sorts positions instead of items
 def merge_sort(arr, key):
-    if len(arr) <= 1:
-        return arr
-    mid = len(arr) // 2
-    left = merge_sort(arr[:mid], key)
-    right = merge_sort(arr[mid:], key)
-    return merge(left, right, key)
-
-def merge(left, right, key):
-    result = []
-    i = j = 0
-    while i < len(left) and j < len(right):
-        # Compare using the key function
-        if key(left[i]) <= key(right[j]):
-            result.append(left[i])
-            i += 1
-        else:
-            result.append(right[j])
-            j += 1
-    result.extend(left[i:])
-    result.extend(right[j:])
-    return result
-
-def counting_sort(arr):
+    if isinstance(key, (list, tuple)):
+        keys = [tuple(k(item) for k in key) for item in arr]
+    else:
+        keys = [key(item) for item in arr]
+    return [arr[i] for i in merge_sort_indices(keys)]
+
+#Bottom-up merge sort of an index permutation: returns array('I') of positions in key order
+#Equal keys keep their original order. Besides keys, it only allocates the order and one scratch array
+def merge_sort_indices(keys):
+    n = len(keys)
+    order = array("I", bytes(4 * n))
+    scratch = array("I", bytes(4 * n))
+
+    # Short runs by binary insertion; bisect does the comparisons, so this is cheaper than the first merge passes
+    for lo in range(0, n, MIN_RUN):
+        run_keys = []
+        run = []
+        for i in range(lo, min(lo + MIN_RUN, n)):
+            key = keys[i]
+            pos = bisect_right(run_keys, key)
+            run_keys.insert(pos, key)
+            run.insert(pos, i)
+        order[lo:lo + len(run)] = array("I", run)
+
+    # Merge pairs of runs from order into scratch, then swap the two buffers
+    width = MIN_RUN
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = lo + width
+            hi = min(mid + width, n)
+            if mid >= hi or keys[order[mid - 1]] <= keys[order[mid]]:
+                scratch[lo:hi] = order[lo:hi]  # already in order (or nothing to merge with)
+                continue
+            i, j, k = lo, mid, lo
+            a, b = order[i], order[j]
+            key_a, key_b = keys[a], keys[b]
+            while True:
+                if key_a <= key_b:  # ties take the left run first, which keeps the sort stable
+                    scratch[k] = a
+                    k += 1
+                    i += 1
+                    if i == mid:
+                        scratch[k:hi] = order[j:hi]
+                        break
+                    a = order[i]
+                    key_a = keys[a]
+                else:
+                    scratch[k] = b
+                    k += 1
+                    j += 1
+                    if j == hi:
+                        scratch[k:hi] = order[i:mid]
+                        break
+                    b = order[j]
+                    key_b = keys[b]
+        order, scratch = scratch, order
+        width *= 2
+    return order
+
+#Maps values to integer ids in sorted order: equal values share an id, and a < b gives id(a) < id(b)
+#Only the distinct values are compared, so author/title columns sort by id in O(n + k log k)
+def intern_ranks(values):
+    distinct = list(dict.fromkeys(values))
+    ranks = {}
+    for rank, i in enumerate(merge_sort_indices(distinct)):
+        ranks[distinct[i]] = rank
+    return [ranks[value] for value in values]
+
+# Integer sort keys for a metadata field: date ordinals, years, or interned author/title ids
+def field_codes(arr, field):
+    if field == "date":
+        ordinals = [item["date"].toordinal() if item["date"] else None for item in arr]
+        # Missing dates sort first; coding them as the day before the earliest date keeps the span small
+        missing = min((ordinal for ordinal in ordinals if ordinal is not None), default=1) - 1
+        return [missing if ordinal is None else ordinal for ordinal in ordinals]
+    if field == "year":
+        return [item["year"] for item in arr]
+    return intern_ranks([item[field].lower() for item in arr])
+
+#Stable LSD radix sort of positions by integer keys; returns array('I') like merge_sort_indices
+#order: positions already sorted by less significant fields (default: 0..n-1), kept on ties
+#Keys spanning at most max(n, 2^16) values take one counting pass, O(n + k); wider keys take one
+#pass per RADIX_BITS-bit digit. Large inputs use NumPy if it is installed
+def radix_sort_indices(keys, order=None):
+    n = len(keys)
+    if order is None:
+        order = array("I", range(n))
+    if n < 2:
+        return array("I", order)
+    low = min(keys)
+    span = max(keys) - low
+
+    if n >= NUMPY_MIN_ROWS:
+        try:
+            import numpy as np  # imported here so small folders and GUI startup never load NumPy
+        except ImportError:
+            np = None
+        if np is not None:
+            codes = np.asarray(keys, dtype=np.int64) - low
+            positions = np.asarray(order, dtype=np.uint32)
+            # A stable argsort of 16-bit values is a radix sort inside NumPy, so every pass is O(n)
+            for shift in range(0, max(span.bit_length(), 1), RADIX_BITS):
+                digits = ((codes[positions] >> shift) & RADIX_MASK).astype(np.uint16)
+                positions = positions[np.argsort(digits, kind="stable")]
+            return array("I", positions.astype(np.uint32).tobytes())
+
+    if span < max(n, 1 << RADIX_BITS):
+        return _counting_pass(keys, order, array("I", bytes(4 * n)), low, 0, span + 1, None)
+    scratch = array("I", bytes(4 * n))
+    for shift in range(0, span.bit_length(), RADIX_BITS):
+        order, scratch = _counting_pass(keys, order, scratch, low, shift, 1 << RADIX_BITS, RADIX_MASK), order
+    return order
+
+#One stable counting sort of order by digit ((key - low) >> shift) & mask, written into out
+#Digits are below size; mask is None when the whole key is the digit
+def _counting_pass(keys, order, out, low, shift, size, mask):
+    counts = [0] * (size + 1)
+    digits = array("I", bytes(4 * len(order)))
+    for n, i in enumerate(order):
+        digit = (keys[i] - low) >> shift
+        if mask is not None:
+            digit &= mask
+        digits[n] = digit
+        counts[digit + 1] += 1
+    starts = list(accumulate(counts))
+    for i, digit in zip(order, digits):
+        out[starts[digit]] = i
+        starts[digit] += 1
+    return out
+
+#Stable sort of arr by one field or a list of fields (e.g. ["author", "date"]), without comparisons:
+#the least significant field is sorted first and each later pass keeps the order of its ties
+def counting_sort(arr, field="date"):
     if not arr:
         return arr
-
-     # Group by year
-    year_buckets = {}
-    for item in arr:
-        year = item["year"]
-        if year not in year_buckets:
-            year_buckets[year] = []
-        year_buckets[year].append(item)
-
-    # Sort years in ascending order
-    sorted_arr = []
-    for year in sorted(year_buckets.keys()):
-        # Sort each bucket by full date (datetime object)
-        sorted_group = sorted(year_buckets[year], key=lambda x: x['date'] or datetime.min)
-        sorted_arr.extend(sorted_group)
-
-    return sorted_arr
+    fields = field if isinstance(field, (list, tuple)) else [field]
+    order = None
+    for name in reversed(fields):
+        order = radix_sort_indices(field_codes(arr, name), order)
+    return [arr[i] for i in order]
@@ -0,0 +1,86 @@
+# Disjoint-set (union-find) over similarity edges: groups of documents that are linked by a chain of
+# similar pairs (e.g. students sharing work) are found in one pass over the edges, which can be a stream.
+# Only a few array entries per document are kept, never the edges themselves
+from array import array
+
+class DisjointSet:
+    def __init__(self):
+        self.ids = {}  # name -> id
+        self.names = []  # id -> name
+        self.parent = array("I")
+        self.size = array("I")
+        # Per-component statistics, valid at each component's root
+        self.edges = array("Q")
+        self.weight_sum = array("d")
+        self.weight_max = array("d")
+
+    def add(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.parent.append(i)
+            self.size.append(1)
+            self.edges.append(0)
+            self.weight_sum.append(0.0)
+            self.weight_max.append(0.0)
+        return i
+
+    # Root of i's component; path halving makes every later find on this path shorter
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Records one edge; the smaller component is attached under the larger one
+    def union(self, a, b, weight=1.0):
+        ra = self.find(self.add(a))
+        rb = self.find(self.add(b))
+        if ra != rb:
+            if self.size[ra] < self.size[rb]:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+            self.size[ra] += self.size[rb]
+            self.edges[ra] += self.edges[rb]
+            self.weight_sum[ra] += self.weight_sum[rb]
+            self.weight_max[ra] = max(self.weight_max[ra], self.weight_max[rb])
+        self.edges[ra] += 1
+        self.weight_sum[ra] += weight
+        self.weight_max[ra] = max(self.weight_max[ra], weight)
+        return ra
+
+    # edges: iterable of (a, b) or (a, b, weight), consumed once
+    def add_edges(self, edges):
+        for edge in edges:
+            self.union(*edge)
+
+    def component_count(self):
+        return sum(1 for i in range(len(self.names)) if self.parent[i] == i)
+
+    # {root id: [member ids]} for every component with at least min_size documents
+    def components(self, min_size=2):
+        groups = {}
+        for i in range(len(self.names)):
+            root = self.find(i)
+            if self.size[root] >= min_size:
+                groups.setdefault(root, []).append(i)
+        return groups
+
+    # One entry per cluster, biggest first
+    def cluster_report(self, min_size=2):
+        report = []
+        for root, members in self.components(min_size).items():
+            size = self.size[root]
+            edges = self.edges[root]
+            possible = size * (size - 1) // 2
+            report.append({
+                "members": sorted(self.names[i] for i in members),
+                "size": size,
+                "edges": edges,
+                "mean_similarity": self.weight_sum[root] / edges if edges else 0,
+                "max_similarity": self.weight_max[root],
+                "density": min(1.0, edges / possible) if possible else 0
+            })
+        return sorted(report, key=lambda cluster: (-cluster["size"], -cluster["mean_similarity"]))
@@ -0,0 +1,220 @@
+# Winnowing fingerprints (as in MOSS) and an on-disk archive of them
+# A document is cut into the same k-word phrases as split_into_phrases, each phrase is hashed,
+# and the smallest hash of every window of consecutive phrase hashes is kept as a fingerprint.
+# Any passage of at least k + window - 1 words shared by two documents shares a fingerprint
+import heapq
+import mmap
+import os
+import re
+import struct
+import tempfile
+from collections import deque
+import tools.searchTools as search
+import tools.compression as compression
+
+KGRAM_WORDS = 5  # same phrase length as split_into_phrases
+WINNOW_WINDOW = 4  # so copied passages of 8 or more words are always caught
+
+ARCHIVE_MAGIC = b"CSWF"
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct(">BHHIQ")  # version, k, window, document count, record count
+RECORD = struct.Struct(">QII")  # fingerprint, document id, character offset
+RUN_RECORDS = 1 << 20  # records sorted in memory at once while building; larger archives merge sorted runs
+
+#Returns one (hash, phrase index) per window: the rightmost smallest hash, skipping repeats
+def winnow(hashes, window=WINNOW_WINDOW):
+    if len(hashes) < window:
+        if not hashes:
+            return []
+        smallest = min(hashes)
+        i = len(hashes) - 1 - hashes[::-1].index(smallest)
+        return [(smallest, i)]
+
+    selected = []
+    minima = deque()  # phrase indexes whose hashes increase from left to right
+    for i, h in enumerate(hashes):
+        while minima and hashes[minima[-1]] >= h:
+            minima.pop()
+        minima.append(i)
+        if minima[0] <= i - window:
+            minima.popleft()
+        if i >= window - 1 and (not selected or selected[-1][1] != minima[0]):
+            selected.append((hashes[minima[0]], minima[0]))
+    return selected
+
+#Returns [(fingerprint, character offset of the phrase)] for a text
+def fingerprints(text, k=KGRAM_WORDS, window=WINNOW_WINDOW):
+    spans = [m.start() for m in re.finditer(r"\S+", text)]
+    words = text.lower().split()
+    return [(h, spans[i]) for h, i in winnow(search.shingle_hashes(words, k), window)]
+
+#Sorted records of a temporary run file, read back a block at a time
+def _read_run(f):
+    f.seek(0)
+    while True:
+        block = f.read(RECORD.size * 4096)
+        if not block:
+            return
+        yield from RECORD.iter_unpack(block)
+
+def load_archive(path):
+    with open(path, "rb") as f:
+        data = f.read(len(ARCHIVE_MAGIC) + ARCHIVE_HEADER.size)
+        if data[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not a fingerprint archive")
+        version, k, window, doc_count, record_count = ARCHIVE_HEADER.unpack_from(data, len(ARCHIVE_MAGIC))
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported fingerprint archive version {version}")
+        names = []
+        for _ in range(doc_count):
+            length, = struct.unpack(">H", f.read(2))
+            names.append(f.read(length).decode("utf-8"))
+        records_start = f.tell()
+        # The records are never read into memory; lookups binary search the mapped file
+        records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if record_count else b""
+    return {
+        "k": k,
+        "window": window,
+        "names": names,
+        "count": record_count,
+        "start": records_start,
+        "records": records
+    }
+
+def close_archive(archive):
+    if archive["count"]:
+        archive["records"].close()
+
+#Adds documents to the archive at path, creating it if needed
+#documents: iterable of (name, text). A name already in the archive (or repeated in documents) is
+#skipped, not replaced: archived fingerprints are never rewritten, so re-adding a folder is safe.
+#Returns (number of documents added, number of documents in the archive)
+def add_to_archive(path, documents, k=KGRAM_WORDS, window=WINNOW_WINDOW):
+    archive = load_archive(path) if os.path.exists(path) else None
+    if archive:
+        k, window = archive["k"], archive["window"]
+    names = list(archive["names"]) if archive else []
+    old_names = len(names)
+    known = set(names)
+    old_count = archive["count"] if archive else 0
+
+    # Fingerprint the new documents into sorted runs on disk
+    runs = []
+    batch = []
+    count = old_count
+    tmp_path = None
+    try:
+        for name, text in documents:
+            if name in known:
+                continue
+            known.add(name)
+            doc_id = len(names)
+            names.append(name)
+            batch.extend((h, doc_id, offset) for h, offset in fingerprints(text, k, window))
+            if len(batch) >= RUN_RECORDS:
+                runs.append(_write_run(batch))
+                count += len(batch)
+                batch = []
+        if archive and len(names) == old_names:
+            return 0, old_names  # nothing new, so the archive is left as it is
+        batch.sort()
+        count += len(batch)
+
+        # A unique name next to the archive, so concurrent adds never write into the same file
+        fd, tmp_path = compression.create_temp_file(path)
+        with os.fdopen(fd, "wb") as out:
+            out.write(ARCHIVE_MAGIC + ARCHIVE_HEADER.pack(ARCHIVE_VERSION, k, window, len(names), count))
+            for name in names:
+                encoded = name.encode("utf-8")
+                out.write(struct.pack(">H", len(encoded)) + encoded)
+
+            # New records are spliced between raw byte ranges of the old ones, so adding a few
+            # documents to a big archive costs a file copy plus one search per new record.
+            # New doc ids are the largest, so they go after old records with the same fingerprint
+            copied = 0
+            buffer = []
+            for record in heapq.merge(iter(batch), *[_read_run(run) for run in runs]):
+                if copied < old_count:
+                    end = _first_record(archive, record[0] + 1, copied)
+                    if end > copied:
+                        out.write(b"".join(buffer))
+                        buffer = []
+                        _copy_records(out, archive, copied, end)
+                        copied = end
+                buffer.append(RECORD.pack(*record))
+                if len(buffer) >= 4096:
+                    out.write(b"".join(buffer))
+                    buffer = []
+            out.write(b"".join(buffer))
+            _copy_records(out, archive, copied, old_count)
+    except BaseException:
+        if tmp_path:
+            os.remove(tmp_path)
+        raise
+    finally:
+        for run in runs:
+            run.close()
+        if archive:
+            close_archive(archive)
+    # Renamed only once the archive is closed and the new one complete: never a half-written archive
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+    return len(names) - old_names, len(names)
+
+def _write_run(batch):
+    batch.sort()
+    run = tempfile.TemporaryFile()
+    for start in range(0, len(batch), 4096):
+        run.write(b"".join(RECORD.pack(*record) for record in batch[start:start + 4096]))
+    return run
+
+#Copies records first..last of an archive unchanged, a few megabytes at a time
+def _copy_records(out, archive, first, last):
+    step = (1 << 22) // RECORD.size
+    for i in range(first, last, step):
+        out.write(archive["records"][archive["start"] + i * RECORD.size:archive["start"] + min(last, i + step) * RECORD.size])
+
+#Index of the first record at or after lo whose fingerprint is >= h
+def _first_record(archive, h, lo):
+    records, start = archive["records"], archive["start"]
+    hi = archive["count"]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if RECORD.unpack_from(records, start + mid * RECORD.size)[0] < h:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+#Matches a text against every archived document in one pass over its sorted fingerprints
+#Returns [(name, similarity_percent, [(offset in text, offset in archived document)])],
+#most similar first; similarity is the share of the text's fingerprints found in that document
+def check_archive(archive, text):
+    offsets = {}
+    for h, offset in fingerprints(text, archive["k"], archive["window"]):
+        offsets.setdefault(h, []).append(offset)
+
+    shared = {}  # doc id -> number of distinct fingerprints in common
+    pairs = {}
+    lo = 0
+    for h in sorted(offsets):
+        # Fingerprints are looked up in increasing order, so each search starts where the last ended
+        lo = _first_record(archive, h, lo)
+        i = lo
+        seen = set()
+        while i < archive["count"]:
+            record_hash, doc_id, archived_offset = RECORD.unpack_from(archive["records"], archive["start"] + i * RECORD.size)
+            if record_hash != h:
+                break
+            if doc_id not in seen:
+                seen.add(doc_id)
+                shared[doc_id] = shared.get(doc_id, 0) + 1
+            pairs.setdefault(doc_id, []).extend((offset, archived_offset) for offset in offsets[h])
+            i += 1
+
+    results = [(archive["names"][doc_id], (count / len(offsets)) * 100, sorted(pairs[doc_id]))
+               for doc_id, count in shared.items()]
+    return sorted(results, key=lambda result: result[1], reverse=True)